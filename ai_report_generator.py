@@ -3,99 +3,105 @@ AI-Powered Natural Language Report Generator
 Uses Claude API to create human-readable business reports
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import json
+import os
+import random
+from collections import OrderedDict
 from datetime import datetime
 
-class AIReportGenerator:
-    """Generate natural language reports using Claude API"""
-    
-    def __init__(self, trend_analyzer, anomaly_detector, insight_generator):
-        self.trend_analyzer = trend_analyzer
-        self.anomaly_detector = anomaly_detector
-        self.insight_generator = insight_generator
-    
-    async def generate_executive_report(self):
-        """Generate a complete executive report in natural language"""
-        
-        # Gather all analysis data
-        trends = self.trend_analyzer.analyze_trends()
-        anomalies = self.anomaly_detector.detect_all_anomalies()
-        summary = self.insight_generator.generate_executive_summary()
-        actions = self.insight_generator.generate_business_actions()
-        
-        # Create structured prompt for Claude
-        prompt = self._build_report_prompt(trends, anomalies, summary, actions)
-        
+import httpx
+import jinja2
+
+def _new_client():
+    """API client for one report or batch run, closed by the caller's async with"""
+    # The app runs each report under its own asyncio.run, so a client cannot
+    # outlive the event loop it was opened on
+    return httpx.AsyncClient(
+        base_url="https://api.anthropic.com",
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+
+
+# At most this many API requests are in flight at once; transient failures
+# (rate limits, server errors, dropped connections) are retried with
+# exponential backoff and jitter.
+MAX_CONCURRENT_REQUESTS = 10
+MAX_ATTEMPTS = 5
+RETRY_INITIAL_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+_SEMAPHORE = None
+_SEMAPHORE_LOOP = None
+
+
+def _get_semaphore():
+    """Return the request-limiting semaphore bound to the running event loop"""
+    global _SEMAPHORE, _SEMAPHORE_LOOP
+    loop = asyncio.get_running_loop()
+    if _SEMAPHORE is None or _SEMAPHORE_LOOP is not loop:
+        _SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        _SEMAPHORE_LOOP = loop
+    return _SEMAPHORE
+
+
+def _is_retryable(error):
+    """Whether a failed request is worth sending again"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+async def _send(client, method, url, json=None, stream=False):
+    """Send an API request, retrying transient failures; the caller holds the semaphore"""
+    for attempt in range(MAX_ATTEMPTS):
         try:
-            # Call Claude API
-            response = await fetch("https://api.anthropic.com/v1/messages", {
-                "method": "POST",
-                "headers": {
-                    "Content-Type": "application/json",
-                },
-                "body": json.dumps({
-                    "model": "claude-sonnet-4-20250514",
-                    "max_tokens": 4000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                })
-            })
-            
-            data = await response.json()
-            report_text = data['content'][0]['text']
-            
-            return {
-                "success": True,
-                "report": report_text,
-                "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "fallback_report": self._generate_fallback_report(summary, actions)
-            }
-    
-    def _build_report_prompt(self, trends, anomalies, summary, actions):
-        """Build a comprehensive prompt for Claude"""
-        
-        prompt = f"""You are a senior business analyst writing an executive report for a non-technical business leader. 
+            response = await client.send(
+                client.build_request(method, url, json=json, headers=_api_headers()),
+                stream=stream
+            )
+            if response.is_error:
+                if stream:
+                    await response.aread()
+                    await response.aclose()
+                response.raise_for_status()
+            return response
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            if attempt == MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            delay = min(RETRY_INITIAL_DELAY * 2 ** attempt, RETRY_MAX_DELAY)
+            await asyncio.sleep(delay + random.uniform(0, 1))
 
-Your task is to analyze this data and create a clear, compelling, action-oriented report that a CEO or business owner can read in 5 minutes and immediately understand what's happening in their business.
 
-DATA ANALYSIS RESULTS:
-======================
+# Reports already written by Claude, keyed by a digest of the analysis that
+# produced them. Re-running the same workflow on unchanged data returns the
+# stored report instead of paying for another API round trip.
+_REPORT_CACHE = OrderedDict()
+_REPORT_CACHE_SIZE = 128
 
-DATASET OVERVIEW:
-- Size: {summary['dataset_size']}
-- Data Quality Score: {summary['data_quality']['score']}% ({summary['data_quality']['grade']})
-- Quality Assessment: {summary['data_quality']['recommendation']}
 
-KEY METRICS PERFORMANCE:
-{json.dumps(summary['key_metrics'], indent=2)}
+def _report_cache_key(prompt):
+    """Digest of the dataset-specific prompt, used as the report cache key"""
+    return hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
 
-ALERTS & ISSUES:
-{json.dumps(summary['alerts'], indent=2)}
 
-DETECTED ANOMALIES:
-- Outliers: {json.dumps(anomalies['outliers'], indent=2)}
-- Missing Data: {anomalies['missing_patterns']['total_missing_cells']} cells missing
-- Duplicates: {anomalies['duplicates']['count']} duplicate records
-- Data Quality Issues: {json.dumps(anomalies['data_quality_issues'], indent=2)}
+def _remember_report(cache_key, report_text):
+    """Store a finished report, evicting the least recently used one when full"""
+    _REPORT_CACHE[cache_key] = report_text
+    if len(_REPORT_CACHE) > _REPORT_CACHE_SIZE:
+        _REPORT_CACHE.popitem(last=False)
 
-NUMERIC TRENDS:
-{json.dumps(trends['numeric_trends'], indent=2)}
 
-CATEGORICAL DISTRIBUTIONS:
-{json.dumps(trends['categorical_distributions'], indent=2)}
+# Invariant part of the report prompt. It is sent as its own content block
+# marked for prompt caching, so it must stay byte-identical between calls:
+# never format dataset values into it.
+STATIC_INSTRUCTIONS = """You are a senior business analyst writing an executive report for a non-technical business leader. 
 
-TOP PRIORITY ACTIONS:
-{json.dumps(actions[:5], indent=2)}
+Your task is to analyze the data analysis results that follow and create a clear, compelling, action-oriented report that a CEO or business owner can read in 5 minutes and immediately understand what's happening in their business.
 
 WRITE A COMPREHENSIVE EXECUTIVE REPORT WITH THESE SECTIONS:
 
@@ -140,58 +146,133 @@ WRITING STYLE REQUIREMENTS:
 - Include specific numbers and percentages to build credibility
 - End each section with clear "what to do next" guidance
 
-Make it feel like a trusted advisor is explaining the business to the owner over coffee, not a technical report.
+Make it feel like a trusted advisor is explaining the business to the owner over coffee, not a technical report."""
+
+
+def _api_headers():
+    """Headers sent with every Anthropic API request"""
+    return {
+        "x-api-key": os.getenv("ANTHROPIC_API_KEY", ""),
+        "anthropic-version": "2023-06-01",
+        "anthropic-beta": "prompt-caching-2024-07-31",
+    }
+
+
+def _message_params(prompt, max_tokens):
+    """Request body for a report, with the static instructions marked for caching"""
+    return {
+        "model": "claude-sonnet-4-20250514",
+        "max_tokens": max_tokens,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": STATIC_INSTRUCTIONS,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {
+                        "type": "text",
+                        "text": prompt
+                    }
+                ]
+            }
+        ],
+    }
 
-Begin the report now:"""
 
-        return prompt
+async def _run_message_batch(requests):
+    """Submit requests to the Message Batches API and return {custom_id: text or None}"""
+    async with _new_client() as client:
+        return await _collect_batch(client, requests)
+
+
+async def _collect_batch(client, requests):
+    """Submit a batch, poll it until it ends and read its results over one client"""
+    async with _get_semaphore():
+        response = await _send(client, "POST", "/v1/messages/batches", json={"requests": requests})
+    batch = response.json()
     
-    def _generate_fallback_report(self, summary, actions):
-        """Generate a basic report if API fails"""
-        
-        report = f"""
+    # Batches finish in minutes rather than seconds, so back off between polls
+    delay = 2.0
+    while batch["processing_status"] != "ended":
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 60.0)
+        async with _get_semaphore():
+            response = await _send(client, "GET", f"/v1/messages/batches/{batch['id']}")
+        batch = response.json()
+    
+    texts = {}
+    async with _get_semaphore():
+        response = await _send(client, "GET", batch["results_url"], stream=True)
+        try:
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                result = entry["result"]
+                if result["type"] == "succeeded":
+                    texts[entry["custom_id"]] = "".join(
+                        block["text"] for block in result["message"]["content"] if block["type"] == "text"
+                    )
+                else:
+                    texts[entry["custom_id"]] = None
+        finally:
+            await response.aclose()
+    return texts
+
+
+# Response budget: enough for the six report sections, plus room to discuss
+# each metric, alert and action handed to the model.
+REPORT_BASE_TOKENS = 2000
+REPORT_TOKENS_PER_FINDING = 150
+REPORT_MAX_TOKENS = 4000
+
+
+# Offline report layouts, compiled once at import
+FALLBACK_TPL = """
 # EXECUTIVE BUSINESS REPORT
-Generated: {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
+Generated: {{ now.strftime("%B %d, %Y at %I:%M %p") }}
 
 ## 📊 AT A GLANCE
 
-Your dataset contains **{summary['dataset_size']}** with an overall data quality score of **{summary['data_quality']['score']}%**.
+Your dataset contains **{{ summary['dataset_size'] }}** with an overall data quality score of **{{ summary['data_quality']['score'] }}%**.
 
-**Quality Grade:** {summary['data_quality']['grade']}
-**Assessment:** {summary['data_quality']['recommendation']}
+**Quality Grade:** {{ summary['data_quality']['grade'] }}
+**Assessment:** {{ summary['data_quality']['recommendation'] }}
 
 ## 🎯 KEY METRICS SNAPSHOT
 
-"""
-        for metric in summary['key_metrics'][:3]:
-            report += f"**{metric['name']}:** {metric['trend']} (Average: {metric['average']})\n"
-        
-        report += "\n## 🚨 URGENT ATTENTION REQUIRED\n\n"
-        
-        if summary['alerts']:
-            for alert in summary['alerts']:
-                report += f"- {alert}\n"
-        else:
-            report += "✅ No urgent issues detected\n"
-        
-        report += "\n## 💡 TOP 3 PRIORITY ACTIONS\n\n"
-        
-        for i, action in enumerate(actions[:3], 1):
-            report += f"""
-### {i}. {action['Action']}
+{% for metric in summary['key_metrics'][:3] %}
+**{{ metric['name'] }}:** {{ metric['trend'] }} (Average: {{ metric['average'] }})
+{% endfor %}
+
+## 🚨 URGENT ATTENTION REQUIRED
+
+{% for alert in summary['alerts'] %}
+- {{ alert }}
+{% else %}
+✅ No urgent issues detected
+{% endfor %}
+
+## 💡 TOP 3 PRIORITY ACTIONS
+
+{% for action in actions[:3] %}
+
+### {{ loop.index }}. {{ action['Action'] }}
 
-**Why this matters:** {action['Reason']}
+**Why this matters:** {{ action['Reason'] }}
 
-**What to do now:** {action['Quick Win']}
+**What to do now:** {{ action['Quick Win'] }}
 
-**Expected benefit:** {action['Expected Benefit']}
+**Expected benefit:** {{ action['Expected Benefit'] }}
 
-**Owner:** {action['Owner']} | **Timeline:** {action['Timeline']}
+**Owner:** {{ action['Owner'] }} | **Timeline:** {{ action['Timeline'] }}
 
 ---
-"""
-        
-        report += """
+{% endfor %}
+
 ## 📈 NEXT STEPS
 
 1. Review the priority actions above with your team
@@ -203,101 +284,292 @@ Your dataset contains **{summary['dataset_size']}** with an overall data quality
 
 *This is an automated analysis. For best results, review with your data team.*
 """
-        
-        return report
-    
-    def generate_one_page_summary(self, summary, actions):
-        """Generate a one-page summary for quick reference"""
-        
-        critical_actions = [a for a in actions if "🔴" in a['Priority']]
-        high_actions = [a for a in actions if "🟡" in a['Priority']]
-        
-        one_pager = f"""
+
+ONEPAGER_TPL = """
 # ONE-PAGE BUSINESS SUMMARY
-{datetime.now().strftime("%B %d, %Y")}
+{{ now.strftime("%B %d, %Y") }}
 
 ## THE HEADLINE
-{summary['data_quality']['recommendation']}
+{{ summary['data_quality']['recommendation'] }}
 
 ## BY THE NUMBERS
-- **Data Quality:** {summary['data_quality']['score']}% {summary['data_quality']['grade']}
-- **Records Analyzed:** {summary['dataset_size']}
-- **Critical Issues:** {len(critical_actions)}
-- **Quick Wins Available:** {len(high_actions)}
+- **Data Quality:** {{ summary['data_quality']['score'] }}% {{ summary['data_quality']['grade'] }}
+- **Records Analyzed:** {{ summary['dataset_size'] }}
+- **Critical Issues:** {{ critical_count }}
+- **Quick Wins Available:** {{ high_count }}
 
 ## TOP 3 THINGS YOU NEED TO KNOW
 
-"""
-        for i, metric in enumerate(summary['key_metrics'][:3], 1):
-            one_pager += f"{i}. **{metric['name']}** is {metric['trend'].lower()} (avg: {metric['average']})\n"
-        
-        one_pager += f"""
+{% for metric in summary['key_metrics'][:3] %}
+{{ loop.index }}. **{{ metric['name'] }}** is {{ metric['trend'].lower() }} (avg: {{ metric['average'] }})
+{% endfor %}
+
 
 ## THIS WEEK'S PRIORITIES
 
-"""
-        for i, action in enumerate(actions[:3], 1):
-            one_pager += f"**{i}.** {action['Action']} → {action['Owner']}\n"
-        
-        one_pager += f"""
+{% for action in actions[:3] %}
+**{{ loop.index }}.** {{ action['Action'] }} → {{ action['Owner'] }}
+{% endfor %}
+
 
 ## BOTTOM LINE
-{"✅ Your data is in good shape. Focus on growth opportunities." if summary['data_quality']['score'] > 85 else "⚠️ Data quality needs attention before making major decisions."}
+{% if summary['data_quality']['score'] > 85 %}
+✅ Your data is in good shape. Focus on growth opportunities.
+{% else %}
+⚠️ Data quality needs attention before making major decisions.
+{% endif %}
 
 ---
 *Full detailed report available in the complete analysis*
 """
-        
-        return one_pager
-    
-    def export_to_pdf_format(self, report_text):
-        """Format report for PDF export (returns markdown with styling)"""
-        
-        styled_report = f"""
+
+PDF_TPL = """
 <style>
-@page {{
+@page {
     margin: 2cm;
-}}
-body {{
+}
+body {
     font-family: 'Segoe UI', Arial, sans-serif;
     line-height: 1.6;
     color: #333;
-}}
-h1 {{
+}
+h1 {
     color: #1f77b4;
     border-bottom: 3px solid #1f77b4;
     padding-bottom: 10px;
-}}
-h2 {{
+}
+h2 {
     color: #2ca02c;
     margin-top: 30px;
-}}
-.highlight {{
+}
+.highlight {
     background: #fff3cd;
     padding: 15px;
     border-left: 4px solid #ffc107;
     margin: 20px 0;
-}}
-.critical {{
+}
+.critical {
     background: #f8d7da;
     padding: 15px;
     border-left: 4px solid #dc3545;
     margin: 20px 0;
-}}
-.success {{
+}
+.success {
     background: #d4edda;
     padding: 15px;
     border-left: 4px solid #28a745;
     margin: 20px 0;
-}}
+}
 </style>
 
-{report_text}
+{{ report_text }}
 
 ---
 
-**Report Generated:** {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
+**Report Generated:** {{ now.strftime("%B %d, %Y at %I:%M %p") }}
 **Analysis Tool:** AI Workflow & Report Generator
 """
+
+_JINJA_ENV = jinja2.Environment(
+    loader=jinja2.DictLoader({"fallback": FALLBACK_TPL, "onepager": ONEPAGER_TPL, "pdf": PDF_TPL}),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    auto_reload=False
+)
+_FALLBACK = _JINJA_ENV.get_template("fallback")
+_ONEPAGER = _JINJA_ENV.get_template("onepager")
+_PDF = _JINJA_ENV.get_template("pdf")
+
+
+class AIReportGenerator:
+    """Generate natural language reports using Claude API"""
+    
+    def __init__(self, trend_analyzer, anomaly_detector, insight_generator):
+        self.trend_analyzer = trend_analyzer
+        self.anomaly_detector = anomaly_detector
+        self.insight_generator = insight_generator
+    
+    async def _gather_analysis(self):
+        """Run the analyzers the report is built from"""
+        # Independent, so run them side by side
+        return await asyncio.gather(
+            asyncio.to_thread(self.trend_analyzer.analyze_trends),
+            self.anomaly_detector.detect_all_anomalies_async(),
+            asyncio.to_thread(self.insight_generator.generate_executive_summary),
+            asyncio.to_thread(self.insight_generator.generate_business_actions)
+        )
+    
+    async def generate_executive_report(self, analysis=None):
+        """Stream the executive report text from Claude as it is generated"""
+        
+        trends, anomalies, summary, actions = analysis or await self._gather_analysis()
+        
+        # Create structured prompt for Claude
+        prompt = self._build_report_prompt(trends, anomalies, summary, actions)
+        
+        cache_key = _report_cache_key(prompt)
+        if cache_key in _REPORT_CACHE:
+            _REPORT_CACHE.move_to_end(cache_key)
+            yield _REPORT_CACHE[cache_key]
+            return
+        
+        # Call Claude API, reading the server-sent events as they arrive. Only
+        # opening the stream is retried, so no text is ever yielded twice.
+        chunks = []
+        async with _new_client() as client, _get_semaphore():
+            response = await _send(
+                client,
+                "POST",
+                "/v1/messages",
+                json={**_message_params(prompt, self._estimate_max_tokens(summary, actions)), "stream": True},
+                stream=True
+            )
+            try:
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    if event.get("type") == "error":
+                        raise RuntimeError(event["error"].get("message", "Streaming error"))
+                    if event.get("type") == "content_block_delta" and event["delta"].get("type") == "text_delta":
+                        chunks.append(event["delta"]["text"])
+                        yield chunks[-1]
+            finally:
+                await response.aclose()
+        
+        _remember_report(cache_key, "".join(chunks))
+    
+    async def collect_executive_report(self):
+        """Generate a complete executive report in natural language"""
+        
+        analysis = await self._gather_analysis()
+        summary, actions = analysis[2], analysis[3]
+        
+        try:
+            chunks = [text async for text in self.generate_executive_report(analysis)]
+            
+            return {
+                "success": True,
+                "report": "".join(chunks),
+                "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "fallback_report": self._generate_fallback_report(summary, actions)
+            }
+    
+    @classmethod
+    async def generate_batch(cls, generators):
+        """Generate executive reports for several datasets as one Message Batches job"""
+        
+        if len(generators) <= 1:
+            return list(await asyncio.gather(*(g.collect_executive_report() for g in generators)))
+        
+        analyses = await asyncio.gather(*(g._gather_analysis() for g in generators))
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        reports = [None] * len(generators)
+        requests = []
+        keys = {}
+        
+        for i, (generator, analysis) in enumerate(zip(generators, analyses)):
+            prompt = generator._build_report_prompt(*analysis)
+            cache_key = _report_cache_key(prompt)
+            if cache_key in _REPORT_CACHE:
+                _REPORT_CACHE.move_to_end(cache_key)
+                reports[i] = {"success": True, "report": _REPORT_CACHE[cache_key], "generated_at": generated_at}
+                continue
+            keys[f"rpt-{i}"] = cache_key
+            requests.append({
+                "custom_id": f"rpt-{i}",
+                "params": _message_params(prompt, generator._estimate_max_tokens(analysis[2], analysis[3]))
+            })
+        
+        try:
+            texts = await _run_message_batch(requests) if requests else {}
+            error = "Request did not succeed in the batch"
+        except Exception as e:
+            texts = {}
+            error = str(e)
+        
+        for i, (generator, analysis) in enumerate(zip(generators, analyses)):
+            if reports[i] is not None:
+                continue
+            report_text = texts.get(f"rpt-{i}")
+            if report_text is None:
+                reports[i] = {
+                    "success": False,
+                    "error": error,
+                    "fallback_report": generator._generate_fallback_report(analysis[2], analysis[3])
+                }
+                continue
+            _remember_report(keys[f"rpt-{i}"], report_text)
+            reports[i] = {"success": True, "report": report_text, "generated_at": generated_at}
+        
+        return reports
+    
+    def _estimate_max_tokens(self, summary, actions):
+        """Size the response budget to the amount of findings being reported"""
+        findings = len(summary['key_metrics']) + len(summary['alerts']) + len(actions[:5])
+        return min(REPORT_BASE_TOKENS + REPORT_TOKENS_PER_FINDING * findings, REPORT_MAX_TOKENS)
+    
+    def _build_report_prompt(self, trends, anomalies, summary, actions):
+        """Build the dataset-specific part of the prompt (follows STATIC_INSTRUCTIONS)"""
         
-        return styled_report
\ No newline at end of file
+        prompt = f"""DATA ANALYSIS RESULTS:
+======================
+
+DATASET OVERVIEW:
+- Size: {summary['dataset_size']}
+- Data Quality Score: {summary['data_quality']['score']}% ({summary['data_quality']['grade']})
+- Quality Assessment: {summary['data_quality']['recommendation']}
+
+KEY METRICS PERFORMANCE:
+{json.dumps(summary['key_metrics'], indent=2)}
+
+ALERTS & ISSUES:
+{json.dumps(summary['alerts'], indent=2)}
+
+DETECTED ANOMALIES:
+- Outliers: {json.dumps(anomalies['outliers'], indent=2)}
+- Missing Data: {anomalies['missing_patterns']['total_missing_cells']} cells missing
+- Duplicates: {anomalies['duplicates']['count']} duplicate records
+- Data Quality Issues: {json.dumps(anomalies['data_quality_issues'], indent=2)}
+
+NUMERIC TRENDS:
+{json.dumps(trends['numeric_trends'], indent=2)}
+
+CATEGORICAL DISTRIBUTIONS:
+{json.dumps(trends['categorical_distributions'], indent=2)}
+
+TOP PRIORITY ACTIONS:
+{json.dumps(actions[:5], indent=2)}
+
+Begin the report now:"""
+
+        return prompt
+    
+    def _generate_fallback_report(self, summary, actions):
+        """Generate a basic report if API fails"""
+        return _FALLBACK.render(summary=summary, actions=actions, now=datetime.now())
+    
+    def generate_one_page_summary(self, summary, actions):
+        """Generate a one-page summary for quick reference"""
+        
+        critical_actions = [a for a in actions if "🔴" in a['Priority']]
+        high_actions = [a for a in actions if "🟡" in a['Priority']]
+        
+        return _ONEPAGER.render(
+            summary=summary,
+            actions=actions,
+            critical_count=len(critical_actions),
+            high_count=len(high_actions),
+            now=datetime.now()
+        )
+    
+    def export_to_pdf_format(self, report_text):
+        """Format report for PDF export (returns markdown with styling)"""
+        return _PDF.render(report_text=report_text, now=datetime.now())
\ No newline at end of file
@@ -1,19 +1,98 @@
+import asyncio
+import functools
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from data_processor import classify_columns
+
+# The numba threading layer is chosen in data_processor, imported above
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _cached_detector(method):
+    """Compute a detector once per instance and reuse the result afterwards"""
+    @functools.wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self._cache:
+            self._cache[method.__name__] = method(self)
+        return self._cache[method.__name__]
+    return wrapper
+
+
+if njit is not None:
+    # fastmath is left off: it lets the compiler assume no NaNs, and missing
+    # cells are NaN here
+    @njit(parallel=True, cache=True)
+    def _iqr_scan(arr, lower, upper, out_count, out_min, out_max):
+        """Count outliers and their min/max per column in a single pass"""
+        for j in prange(arr.shape[1]):
+            cmin = np.inf
+            cmax = -np.inf
+            cnt = 0
+            lo = lower[j]
+            hi = upper[j]
+            for i in range(arr.shape[0]):
+                v = arr[i, j]
+                if v < lo or v > hi:
+                    cnt += 1
+                    if v < cmin:
+                        cmin = v
+                    if v > cmax:
+                        cmax = v
+            out_count[j] = cnt
+            out_min[j] = cmin
+            out_max[j] = cmax
+else:
+    _iqr_scan = None
+
 
 class AnomalyDetector:
     """Detects and visualizes anomalies in data with business-friendly explanations"""
     
+    # Hash only this many leading columns when counting duplicate rows. None
+    # hashes every column; a limit speeds up very wide frames but makes the
+    # count approximate (rows equal on those columns are treated as duplicates).
+    duplicate_hash_max_cols = None
+    
+    # Frames with more rows than this use the compiled outlier scan when numba
+    # is installed; below it, NumPy is already dominated by call overhead.
+    numba_min_rows = 100_000
+    
+    # Approximate number of points drawn per series in the outlier charts
+    max_plot_points = 5000
+    
     def __init__(self, df, column_types):
         self.df = df
         self.column_types = column_types
-        self.numeric_cols = [col for col, dtype in column_types.items() 
-                            if dtype in ["integer", "float"]]
-        self.categorical_cols = [col for col, dtype in column_types.items() 
-                                if dtype in ["categorical", "boolean", "text"]]
+        self.numeric_cols, self.categorical_cols, _ = classify_columns(column_types)
+        # Detector results; self.df is never mutated, so they stay valid
+        self._cache = {}
+        
+        self._nrows = len(df)
+        self._ncols = len(df.columns)
+        self._ncells = self._nrows * self._ncols
+        self._hi_card_threshold = self._nrows * 0.8
+        self._mostly_missing_threshold = self._nrows * 0.7
+        
+        # One null mask for the whole frame, shared by the detectors
+        self._null_mask = self.df.isna().to_numpy()
+        
+        # Numeric columns as one float64 block for the statistical scans. The
+        # bounds and extremes are reported as raw values, so the block keeps
+        # full precision.
+        self._numeric_arr = self.df[self.numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._numeric_nanmask = self._null_mask[:, self.df.columns.get_indexer(self.numeric_cols)]
+        
+        # Numeric columns whose names suggest values should never be negative
+        self._positive_keyword_cols = np.array([
+            any(keyword in col.lower() for keyword in ['price', 'amount', 'quantity', 'age', 'count'])
+            for col in self.numeric_cols
+        ], dtype=bool)
     
     def detect_all_anomalies(self):
         """Detect all types of anomalies"""
@@ -26,87 +105,137 @@ class AnomalyDetector:
         }
         return anomalies
     
+    async def detect_all_anomalies_async(self):
+        """Detect all types of anomalies, running the detectors concurrently"""
+        outliers, missing, duplicates, unusual, quality = await asyncio.gather(
+            asyncio.to_thread(self._detect_outliers),
+            asyncio.to_thread(self._detect_missing_patterns),
+            asyncio.to_thread(self._detect_duplicates),
+            asyncio.to_thread(self._detect_unusual_distributions),
+            asyncio.to_thread(self._detect_data_quality_issues)
+        )
+        anomalies = {
+            'outliers': outliers,
+            'missing_patterns': missing,
+            'duplicates': duplicates,
+            'unusual_distributions': unusual,
+            'data_quality_issues': quality
+        }
+        return anomalies
+    
+    @_cached_detector
     def _detect_outliers(self):
         """Detect statistical outliers using IQR method"""
         outliers = {}
-        
-        for col in self.numeric_cols[:5]:  # Limit to first 5 numeric columns
-            data = self.df[col].dropna()
-            if len(data) == 0:
-                continue
-                
-            Q1 = data.quantile(0.25)
-            Q3 = data.quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outlier_mask = (data < lower_bound) | (data > upper_bound)
-            outlier_count = outlier_mask.sum()
-            
-            if outlier_count > 0:
+        cols = self.numeric_cols[:5]  # Limit to first 5 numeric columns
+        if not cols:
+            return outliers
+        
+        numeric = self._numeric_arr[:, :len(cols)]
+        valid_counts = np.count_nonzero(~self._numeric_nanmask[:, :len(cols)], axis=0)
+        has_data = valid_counts > 0
+        cols = [col for col, keep in zip(cols, has_data) if keep]
+        numeric = numeric[:, has_data]
+        valid_counts = valid_counts[has_data]
+        if not cols:
+            return outliers
+        
+        Q1, Q3 = np.nanpercentile(numeric, [25, 75], axis=0)
+        IQR = Q3 - Q1
+        
+        lower_bounds = Q1 - 1.5 * IQR
+        upper_bounds = Q3 + 1.5 * IQR
+        
+        # NaN compares False on both sides, so missing cells never count
+        if _iqr_scan is not None and numeric.shape[0] > self.numba_min_rows:
+            outlier_counts = np.empty(len(cols), dtype=np.int64)
+            min_outliers = np.empty(len(cols), dtype=np.float64)
+            max_outliers = np.empty(len(cols), dtype=np.float64)
+            _iqr_scan(numeric, lower_bounds, upper_bounds, outlier_counts, min_outliers, max_outliers)
+        else:
+            outlier_mask = (numeric < lower_bounds) | (numeric > upper_bounds)
+            outlier_counts = outlier_mask.sum(axis=0)
+            # fmin/fmax skip the NaN fill like nanmin/nanmax, without warning on
+            # columns that have no outliers
+            masked = np.where(outlier_mask, numeric, np.nan)
+            min_outliers = np.fmin.reduce(masked, axis=0)
+            max_outliers = np.fmax.reduce(masked, axis=0)
+        
+        for i, col in enumerate(cols):
+            if outlier_counts[i] > 0:
                 outliers[col] = {
-                    'count': int(outlier_count),
-                    'percentage': float((outlier_count / len(data)) * 100),
-                    'lower_bound': float(lower_bound),
-                    'upper_bound': float(upper_bound),
-                    'min_outlier': float(data[outlier_mask].min()),
-                    'max_outlier': float(data[outlier_mask].max())
+                    'count': int(outlier_counts[i]),
+                    'percentage': float((outlier_counts[i] / valid_counts[i]) * 100),
+                    'lower_bound': float(lower_bounds[i]),
+                    'upper_bound': float(upper_bounds[i]),
+                    'min_outlier': float(min_outliers[i]),
+                    'max_outlier': float(max_outliers[i])
                 }
         
         return outliers
     
+    @_cached_detector
     def _detect_missing_patterns(self):
         """Identify patterns in missing data"""
         missing_info = {}
         
-        for col in self.df.columns:
-            missing_count = self.df[col].isnull().sum()
+        missing_per_col = self._null_mask.sum(axis=0)
+        missing_per_row = self._null_mask.sum(axis=1)
+        
+        for col, missing_count in zip(self.df.columns, missing_per_col):
             if missing_count > 0:
                 missing_info[col] = {
                     'count': int(missing_count),
-                    'percentage': float((missing_count / len(self.df)) * 100)
+                    'percentage': float((missing_count / self._nrows) * 100)
                 }
         
         # Rows with multiple missing values
-        rows_with_missing = (self.df.isnull().sum(axis=1) > len(self.df.columns) * 0.3).sum()
+        rows_with_missing = (missing_per_row > self._ncols * 0.3).sum()
         
         return {
             'by_column': missing_info,
             'problematic_rows': int(rows_with_missing),
-            'total_missing_cells': int(self.df.isnull().sum().sum())
+            'total_missing_cells': int(missing_per_col.sum())
         }
     
+    @_cached_detector
     def _detect_duplicates(self):
         """Detect duplicate rows"""
-        duplicate_count = self.df.duplicated().sum()
+        # One uint64 hash per row; rows sharing a hash are duplicates
+        hashed = self.df
+        if self.duplicate_hash_max_cols is not None:
+            hashed = self.df.iloc[:, :self.duplicate_hash_max_cols]
+        row_hashes = pd.util.hash_pandas_object(hashed, index=False).to_numpy()
+        duplicate_count = len(row_hashes) - np.unique(row_hashes).size
         return {
             'count': int(duplicate_count),
-            'percentage': float((duplicate_count / len(self.df)) * 100)
+            'percentage': float((duplicate_count / self._nrows) * 100)
         }
     
     def _detect_unusual_distributions(self):
         """Detect unusual value distributions"""
         unusual = {}
+        cols = self.numeric_cols[:5]
         
-        for col in self.numeric_cols[:5]:
-            data = self.df[col].dropna()
-            if len(data) == 0:
+        # Zero share and negative count for every column in one pass each
+        numeric = self._numeric_arr[:, :len(cols)]
+        valid_counts = np.count_nonzero(~self._numeric_nanmask[:, :len(cols)], axis=0)
+        zero_pcts = (numeric == 0).sum(axis=0) / np.maximum(valid_counts, 1) * 100
+        negative_counts = (numeric < 0).sum(axis=0)
+        
+        for i, col in enumerate(cols):
+            if valid_counts[i] == 0:
                 continue
             
             # Check for high concentration of zeros
-            zero_pct = (data == 0).sum() / len(data) * 100
-            if zero_pct > 30:
+            if zero_pcts[i] > 30:
                 unusual[col] = unusual.get(col, {})
-                unusual[col]['excessive_zeros'] = float(zero_pct)
+                unusual[col]['excessive_zeros'] = float(zero_pcts[i])
             
             # Check for negative values in typically positive columns
-            if any(keyword in col.lower() for keyword in ['price', 'amount', 'quantity', 'age', 'count']):
-                negative_count = (data < 0).sum()
-                if negative_count > 0:
-                    unusual[col] = unusual.get(col, {})
-                    unusual[col]['unexpected_negatives'] = int(negative_count)
+            if self._positive_keyword_cols[i] and negative_counts[i] > 0:
+                unusual[col] = unusual.get(col, {})
+                unusual[col]['unexpected_negatives'] = int(negative_counts[i])
         
         return unusual
     
@@ -114,30 +243,41 @@ class AnomalyDetector:
         """Identify data quality problems"""
         issues = {}
         
+        # Numeric columns are constant when min == max, which avoids building a
+        # hash set; every other column gets its distinct count taken once
+        numeric = self.df[self.numeric_cols]
+        numeric_constant = (numeric.min() == numeric.max()).to_dict()
+        distinct_counts = {col: self.df[col].nunique() for col in self.df.columns
+                           if col not in numeric_constant}
+        
         # Constant columns (all same value)
-        constant_cols = [col for col in self.df.columns if self.df[col].nunique() == 1]
+        constant_cols = [col for col in self.df.columns
+                         if (numeric_constant[col] if col in numeric_constant
+                             else distinct_counts[col] == 1)]
         if constant_cols:
             issues['constant_columns'] = constant_cols
         
         # High cardinality categorical columns
         high_cardinality = []
         for col in self.categorical_cols:
-            if self.df[col].nunique() > len(self.df) * 0.8:
+            if distinct_counts[col] > self._hi_card_threshold:
                 high_cardinality.append(col)
         if high_cardinality:
             issues['high_cardinality'] = high_cardinality
         
-        # Mostly missing columns
-        mostly_missing = [col for col in self.df.columns 
-                         if self.df[col].isnull().sum() > len(self.df) * 0.7]
+        # Mostly missing columns, from the cached missing-data counts
+        missing_by_column = self._detect_missing_patterns()['by_column']
+        mostly_missing = [col for col, info in missing_by_column.items()
+                         if info['count'] > self._mostly_missing_threshold]
         if mostly_missing:
             issues['mostly_missing'] = mostly_missing
         
         return issues
     
-    def visualize_outliers(self, top_n=3):
+    def visualize_outliers(self, top_n=3, outlier_info=None):
      """Create line plots showing numeric trends with outliers highlighted"""
-     outlier_info = self._detect_outliers()
+     if outlier_info is None:
+        outlier_info = self._detect_outliers()
     
      if not outlier_info:
         return None, "✅ **Great News!** No unusual values detected in your data. All numbers fall within expected ranges."
@@ -155,12 +295,19 @@ class AnomalyDetector:
      for idx, (col, info) in enumerate(sorted_cols, 1):
         data = self.df[col].dropna()
         indices = data.index
+        outlier_mask = (data < info['lower_bound']) | (data > info['upper_bound'])
+        
+        # Thin the main line to about max_plot_points points; every outlier
+        # stays in so spikes are never sampled away
+        shown = np.zeros(len(data), dtype=bool)
+        shown[::max(1, len(data) // self.max_plot_points)] = True
+        shown |= outlier_mask.to_numpy()
         
-        # Create a line for the main data
+        # Create a line for the main data (WebGL, so large series stay cheap)
         fig.add_trace(
-            go.Scatter(
-                x=indices,
-                y=data,
+            go.Scattergl(
+                x=indices[shown],
+                y=data[shown],
                 mode='lines+markers',
                 name=col,
                 line=dict(color='blue'),
@@ -170,10 +317,9 @@ class AnomalyDetector:
         )
         
         # Highlight outliers in red
-        outlier_mask = (data < info['lower_bound']) | (data > info['upper_bound'])
         if outlier_mask.any():
             fig.add_trace(
-                go.Scatter(
+                go.Scattergl(
                     x=indices[outlier_mask],
                     y=data[outlier_mask],
                     mode='markers',
@@ -212,26 +358,30 @@ Expected values should be between {worst_info['lower_bound']:.2f} and {worst_inf
      return fig, insight
 
     
-    def visualize_missing_data(self):
+    def visualize_missing_data(self, missing_info=None):
         """Create visualization of missing data patterns"""
-        missing_info = self._detect_missing_patterns()
+        if missing_info is None:
+            missing_info = self._detect_missing_patterns()
         
         if not missing_info['by_column']:
             return None, "✅ **Excellent!** Your data is complete with no missing information."
         
-        # Create bar chart for missing data by column
-        missing_df = pd.DataFrame(missing_info['by_column']).T
-        missing_df = missing_df.sort_values('percentage', ascending=False)
+        # Create bar chart for missing data by column, most incomplete first
+        columns = np.array(list(missing_info['by_column']), dtype=object)
+        counts = np.array([info['count'] for info in missing_info['by_column'].values()])
+        order = np.argsort(-counts, kind='stable')
+        columns, counts = columns[order], counts[order]
+        percentages = counts / self._nrows * 100
         
         fig = go.Figure(data=[
             go.Bar(
-                x=missing_df.index,
-                y=missing_df['percentage'],
-                text=missing_df['count'],
+                x=columns,
+                y=percentages,
+                text=counts,
                 texttemplate='%{text} missing',
                 textposition='outside',
-                marker_color=['red' if x > 50 else 'orange' if x > 20 else 'yellow' 
-                             for x in missing_df['percentage']]
+                marker_color=np.where(percentages > 50, 'red',
+                                      np.where(percentages > 20, 'orange', 'yellow'))
             )
         ])
         
@@ -243,8 +393,7 @@ Expected values should be between {worst_info['lower_bound']:.2f} and {worst_inf
         )
         
         # Generate insight
-        total_missing_pct = (missing_info['total_missing_cells'] / 
-                            (len(self.df) * len(self.df.columns))) * 100
+        total_missing_pct = (missing_info['total_missing_cells'] / self._ncells) * 100
         worst_col = max(missing_info['by_column'].items(), 
                        key=lambda x: x[1]['percentage'])
         
@@ -270,17 +419,18 @@ This chart reveals which information fields are incomplete in your data. Higher
         
         return fig, insight
     
-    def visualize_duplicate_analysis(self):
+    def visualize_duplicate_analysis(self, dup_info=None):
         """Show duplicate row analysis with clear explanations"""
-        dup_info = self._detect_duplicates()
+        if dup_info is None:
+            dup_info = self._detect_duplicates()
         
         # Create simple bar chart
         fig = go.Figure(data=[
             go.Bar(
                 x=['Unique Records', 'Duplicate Records'],
-                y=[len(self.df) - dup_info['count'], dup_info['count']],
+                y=[self._nrows - dup_info['count'], dup_info['count']],
                 marker_color=['lightgreen', 'salmon'],
-                text=[len(self.df) - dup_info['count'], dup_info['count']],
+                text=[self._nrows - dup_info['count'], dup_info['count']],
                 textposition='auto',
                 texttemplate='%{text} records'
             )
@@ -324,22 +474,27 @@ Remove these duplicate records before generating reports or making business deci
         
         return fig, insight
     
-    def visualize_data_quality_score(self):
+    def visualize_data_quality_score(self, anomalies=None):
         """Create an overall data quality score visualization"""
-        missing_info = self._detect_missing_patterns()
-        dup_info = self._detect_duplicates()
-        outlier_info = self._detect_outliers()
+        if anomalies is not None:
+            missing_info = anomalies['missing_patterns']
+            dup_info = anomalies['duplicates']
+            outlier_info = anomalies['outliers']
+        else:
+            missing_info = self._detect_missing_patterns()
+            dup_info = self._detect_duplicates()
+            outlier_info = self._detect_outliers()
         
         # Calculate quality score
-        total_cells = len(self.df) * len(self.df.columns)
+        total_cells = self._ncells
         missing_cells = missing_info['total_missing_cells']
         completeness_score = ((total_cells - missing_cells) / total_cells) * 100
         
-        uniqueness_score = ((len(self.df) - dup_info['count']) / len(self.df)) * 100
+        uniqueness_score = ((self._nrows - dup_info['count']) / self._nrows) * 100
         
         # Accuracy score based on outliers
         total_outliers = sum(info['count'] for info in outlier_info.values())
-        accuracy_score = max(0, 100 - (total_outliers / len(self.df) * 100))
+        accuracy_score = max(0, 100 - (total_outliers / self._nrows * 100))
         
         overall_score = (completeness_score * 0.4 + uniqueness_score * 0.3 + accuracy_score * 0.3)
         
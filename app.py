@@ -1,19 +1,27 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-import time
-import asyncio
-from data_processor import DataProcessor
-from anomalies import AnomalyDetector
-from summarize import TrendAnalyzer
-from business_insight import BusinessInsightGenerator
-from ai_report_generator import AIReportGenerator
-import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 from datetime import datetime
 import time
+import asyncio
+import hashlib
+import io
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from data_processor import DataProcessor, null_counts
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    from markdown_it import MarkdownIt
+    MD = MarkdownIt()
+except ImportError:
+    MD = None
 # 1. PAGE CONFIGURATION
 st.set_page_config(
     page_title="REPORT-X | AI Workflow Engine",
@@ -22,7 +30,7 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 # 2. PROFESSIONAL THEME INJECTION
-st.markdown("""
+_CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;800&family=JetBrains+Mono:wght@400;600&display=swap');
 
@@ -172,7 +180,9 @@ st.markdown("""
     .timer-badge { background-color:#0d1117; border:1px solid #00ff88; padding:5px 10px; border-radius:12px; font-weight:700; }
 
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # BRANDING
 st.markdown("""
@@ -187,36 +197,39 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize session state
-if 'data_processor' not in st.session_state:
-    st.session_state.data_processor = None
-if 'current_df' not in st.session_state:
-    st.session_state.current_df = None
-if 'original_df' not in st.session_state:
-    st.session_state.original_df = None
-if 'show_trends' not in st.session_state:
-    st.session_state.show_trends = False
-if 'show_anomalies' not in st.session_state:
-    st.session_state.show_anomalies = False
-if 'show_actions' not in st.session_state:
-    st.session_state.show_actions = False
-if 'show_report' not in st.session_state:
-    st.session_state.show_report = False
-if 'execution_times' not in st.session_state:
-    st.session_state.execution_times = {}
-if 'cleaning_performed' not in st.session_state:
-    st.session_state.cleaning_performed = False
-if 'generated_report' not in st.session_state:
-    st.session_state.generated_report = None
+SESSION_DEFAULTS = {
+    'data_processor': None,
+    'current_df': None,
+    'original_df': None,
+    'active_view': None,  # 'trends', 'anomalies', 'actions' or 'report'
+    'execution_times': {},
+    'cleaning_performed': False,
+    'generated_report': None,
+    'df_key': None,
+    'frame_stats': None,
+    'analyses': {},
+}
+for key, value in SESSION_DEFAULTS.items():
+    # Mutable defaults are copied so sessions never share one dict
+    st.session_state.setdefault(key, value.copy() if isinstance(value, dict) else value)
 
 \
+def _frame_stats(df):
+    """Per-column null counts, total nulls and duplicate rows from one null scan"""
+    nulls_per_col = null_counts(df)
+    total_nulls = int(nulls_per_col.sum())
+    dup_count = int(df.duplicated().to_numpy().sum())
+    return nulls_per_col, total_nulls, dup_count
+
 # NEW: Auto-cleaning function
-def auto_clean_data(df, processor):
+def auto_clean_data(df, processor, stats=None):
     """Automatically clean data based on detected issues"""
     cleaning_summary = []
     
     # Check for issues
-    missing_pct = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
-    dup_count = df.duplicated().sum()
+    nulls_per_col, total_nulls, dup_count = stats if stats is not None else _frame_stats(df)
+    total_cells = df.shape[0] * df.shape[1]
+    missing_pct = (total_nulls / total_cells) * 100 if total_cells > 0 else 0
     
     needs_cleaning = False
     
@@ -228,7 +241,7 @@ def auto_clean_data(df, processor):
     if missing_pct > 5:
         needs_cleaning = True
         # Drop columns with >70% missing
-        cols_to_drop = [col for col in df.columns if df[col].isnull().sum() / len(df) > 0.7]
+        cols_to_drop = df.columns[nulls_per_col / len(df) > 0.7].tolist()
         if cols_to_drop:
             cleaning_summary.append(f"🔧 Removed {len(cols_to_drop)} columns with >70% missing data")
     
@@ -245,66 +258,168 @@ def auto_clean_data(df, processor):
     
     return df, ["✅ Data is already clean - no automatic cleaning needed"], False
 
-# File upload section with Quick Guide
-st.markdown("<h3 style='color:#00ff99'>Quick Guide</h3>", unsafe_allow_html=True)
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.markdown("""
-    <div style='
-        background-color:#141a2b;
-        border-radius:12px;
-        padding:20px;
-        text-align:center;
-        border:1px solid #1e2a40'>
-        <h2 style='color:#00ff99'>1</h2>
-        <p style='font-weight:600'>Upload CSV</p>
-        <p style='color:#a0aec0'>Select your data file</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown("""
-    <div style='
-        background-color:#141a2b;
-        border-radius:12px;
-        padding:20px;
-        text-align:center;
-        border:1px solid #1e2a40'>
-        <h2 style='color:#00ff99'>2</h2>
-        <p style='font-weight:600'>Auto-Clean</p>
-        <p style='color:#a0aec0'>Remove duplicates & fix data</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col3:
-    st.markdown("""
-    <div style='
-        background-color:#141a2b;
-        border-radius:12px;
-        padding:20px;
-        text-align:center;
-        border:1px solid #1e2a40'>
-        <h2 style='color:#00ff99'>3</h2>
-        <p style='font-weight:600'>Analyze</p>
-        <p style='color:#a0aec0'>Choose your analysis type</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col4:
-    st.markdown("""
-    <div style='
-        background-color:#141a2b;
-        border-radius:12px;
-        padding:20px;
-        text-align:center;
-        border:1px solid #1e2a40'>
-        <h2 style='color:#00ff99'>4</h2>
-        <p style='font-weight:600'>Export</p>
-        <p style='color:#a0aec0'>Download insights & reports</p>
-    </div>
-    """, unsafe_allow_html=True)
+# The upload is hashed once, into df_key, which is the cache key; Streamlit
+# does not hash the bytes again (leading underscore). The processor is a
+# shared resource so it is never pickled or copied between reruns.
+@st.cache_resource(show_spinner=False)
+def get_processor(_file_bytes, df_key):
+    """DataProcessor holding an uploaded CSV, parsed once per file"""
+    processor = DataProcessor()
+    processor.load_data(io.BytesIO(_file_bytes))
+    return processor
+
+@st.cache_data(show_spinner=False)
+def load_and_clean(_file_bytes, df_key):
+    """Auto-clean an uploaded CSV, cached on the file contents"""
+    processor = get_processor(_file_bytes, df_key)
+    df = processor.original_df
+    stats = _frame_stats(df)
+    cleaned_df, cleaning_summary, was_cleaned = auto_clean_data(df, processor, stats)
+    # Stats for the metric panel describe the frame that is kept
+    if was_cleaned:
+        stats = _frame_stats(cleaned_df)
+    return df, cleaned_df, cleaning_summary, was_cleaned, stats
+
+# Analyzers and their results, built once per dataset. df_key identifies the
+# uploaded file; the frame itself is not hashed (leading underscore). The
+# analyzer modules are imported on first use so the landing page does not
+# pay for them.
+@st.cache_resource(show_spinner=False)
+def get_trend_results(_df, df_key, dtypes_key):
+    """Trend analyzer and analyze_trends() output for a dataset"""
+    from summarize import TrendAnalyzer
+    trend_analyzer = TrendAnalyzer(_df, dict(dtypes_key))
+    return trend_analyzer, trend_analyzer.analyze_trends()
+
+@st.cache_resource(show_spinner=False)
+def get_anomaly_results(_df, df_key, dtypes_key):
+    """Anomaly detector and detect_all_anomalies() output for a dataset"""
+    from anomalies import AnomalyDetector
+    anomaly_detector = AnomalyDetector(_df, dict(dtypes_key))
+    return anomaly_detector, anomaly_detector.detect_all_anomalies()
+
+@st.cache_resource(show_spinner=False)
+def get_insights(_df, df_key, dtypes_key):
+    """Insight generator with its summary, actions and top 3 for a dataset"""
+    from business_insight import BusinessInsightGenerator
+    trend_analyzer, _ = get_trend_results(_df, df_key, dtypes_key)
+    insight_generator = BusinessInsightGenerator(trend_analyzer)
+    return (insight_generator,
+            insight_generator.generate_executive_summary(),
+            insight_generator.generate_business_actions(),
+            insight_generator.generate_top_3_insights())
+
+@st.cache_resource(show_spinner=False)
+def get_report_generator(_df, df_key, dtypes_key):
+    """Report generator over the cached analyzers for a dataset"""
+    from ai_report_generator import AIReportGenerator
+    trend_analyzer, _ = get_trend_results(_df, df_key, dtypes_key)
+    anomaly_detector, _ = get_anomaly_results(_df, df_key, dtypes_key)
+    insight_generator, _, _, _ = get_insights(_df, df_key, dtypes_key)
+    return AIReportGenerator(trend_analyzer, anomaly_detector, insight_generator)
+
+# Not cached: the text carries its generation time, and the analyses it is
+# rendered from are already cached above
+def get_report_text(_df, df_key, dtypes_key, report_type):
+    """Report markdown for a dataset and report type"""
+    ai_report_gen = get_report_generator(_df, df_key, dtypes_key)
+    _, summary, actions, _ = get_insights(_df, df_key, dtypes_key)
+    if report_type == "Executive Summary (1 page)":
+        return ai_report_gen.generate_one_page_summary(summary, actions)
+    # Use fallback for now (can integrate actual API call here)
+    return ai_report_gen._generate_fallback_report(summary, actions)
+
+# The three analyses share no state, so the report view runs them side by
+# side; pandas/numpy release the GIL for most of the heavy lifting
+_ANALYSIS_POOL = ThreadPoolExecutor(max_workers=3)
+
+def _run_in_script_ctx(ctx, getter, *args):
+    """Call an analysis getter on a pool thread attached to the calling script run"""
+    # The pool is shared by every session, so the context is attached per call
+    # rather than once per thread; without it the cached getters log a missing
+    # ScriptRunContext warning and cannot reach the page
+    if ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+    return getter(*args)
+
+async def run_all_analyses(names, df, df_key, dtypes_key):
+    """Run the named analysis getters concurrently"""
+    loop = asyncio.get_running_loop()
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return await asyncio.gather(*(
+        loop.run_in_executor(_ANALYSIS_POOL, _run_in_script_ctx, ctx, ANALYSIS_GETTERS[name],
+                             df, df_key, dtypes_key)
+        for name in names
+    ))
+
+ANALYSIS_GETTERS = {
+    'trends': get_trend_results,
+    'anomalies': get_anomaly_results,
+    'insights': get_insights,
+}
+
+def session_analyses(*names):
+    """Analyzer results for the current dataset, kept in session_state
+
+    Missing entries are filled from the cached getters (concurrently when
+    more than one is needed); the dict is reset whenever a file is loaded.
+    """
+    analyses = st.session_state.analyses
+    missing = [name for name in names if name not in analyses]
+    if missing:
+        args = (st.session_state.current_df, st.session_state.df_key,
+                tuple(st.session_state.data_processor.column_datatypes.items()))
+        if len(missing) == 1:
+            analyses[missing[0]] = ANALYSIS_GETTERS[missing[0]](*args)
+        else:
+            analyses.update(zip(missing, asyncio.run(run_all_analyses(missing, *args))))
+    return [analyses[name] for name in names]
+
+# File upload section with Quick Guide. The cards are formatted once at
+# import into a single grid element rather than four columns.
+_QUICK_GUIDE_CARD = """<div style='
+    background-color:#141a2b;
+    border-radius:12px;
+    padding:20px;
+    text-align:center;
+    border:1px solid #1e2a40'>
+    <h2 style='color:#00ff99'>{step}</h2>
+    <p style='font-weight:600'>{title}</p>
+    <p style='color:#a0aec0'>{desc}</p>
+</div>"""
+_QUICK_GUIDE_STEPS = [
+    ("1", "Upload CSV", "Select your data file"),
+    ("2", "Auto-Clean", "Remove duplicates & fix data"),
+    ("3", "Analyze", "Choose your analysis type"),
+    ("4", "Export", "Download insights & reports"),
+]
+_QUICK_GUIDE_HTML = (
+    "<h3 style='color:#00ff99'>Quick Guide</h3>\n"
+    "<div style='display:grid; grid-template-columns:repeat(4, 1fr); gap:1rem;'>\n"
+    + "\n".join(_QUICK_GUIDE_CARD.format(step=step, title=title, desc=desc)
+                for step, title, desc in _QUICK_GUIDE_STEPS)
+    + "\n</div>"
+)
 
+st.markdown(_QUICK_GUIDE_HTML, unsafe_allow_html=True)
+
+
+_FEATURE_CARD = """    <div class="feature-card">
+        <div class="feature-icon">✩</div>
+        <div class="feature-title">{title}</div>
+        <div class="feature-desc">{desc}</div>
+    </div>"""
+_FEATURES = [
+    ("Summarize Trends", "Get instant overview of your data patterns, metrics performance, and key trends."),
+    ("Identify Anomalies", "Automatically detect unusual values, missing data, and quality issues."),
+    ("Business Actions", "Receive prioritized, actionable recommendations with clear timelines."),
+    ("AI Reports", "Generate comprehensive business intelligence reports automatically."),
+]
+_FEATURE_GRID = (
+    '<div class="feature-container">\n'
+    + "\n".join(_FEATURE_CARD.format(title=title, desc=desc) for title, desc in _FEATURES)
+    + "\n</div>"
+)
 
 # -------------------- FILE UPLOAD (Visual Implementation) --------------------
 st.markdown("<h3 style='color:#ffffff; margin-bottom:20px;'>📂 Upload Your Data</h3>", unsafe_allow_html=True)
@@ -331,41 +446,23 @@ if not uploaded_file:
     """, unsafe_allow_html=True)
 
     # -------------------- FEATURE GRID (Visual Implementation) --------------------
-    st.markdown("""
-    <div class="feature-container">
-        <div class="feature-card">
-            <div class="feature-icon">✩</div>
-            <div class="feature-title">Summarize Trends</div>
-            <div class="feature-desc">Get instant overview of your data patterns, metrics performance, and key trends.</div>
-        </div>
-        <div class="feature-card">
-            <div class="feature-icon">✩</div>
-            <div class="feature-title">Identify Anomalies</div>
-            <div class="feature-desc">Automatically detect unusual values, missing data, and quality issues.</div>
-        </div>
-        <div class="feature-card">
-            <div class="feature-icon">✩</div>
-            <div class="feature-title">Business Actions</div>
-            <div class="feature-desc">Receive prioritized, actionable recommendations with clear timelines.</div>
-        </div>
-        <div class="feature-card">
-            <div class="feature-icon">✩</div>
-            <div class="feature-title">AI Reports</div>
-            <div class="feature-desc">Generate comprehensive business intelligence reports automatically.</div>
-        </div>
-    </div>
-
-    """, unsafe_allow_html=True)
-if uploaded_file and st.session_state.data_processor is None:
-    # (Keep your existing data processing logic here)
-    processor = DataProcessor()
-    df = processor.load_data(uploaded_file)
-    st.session_state.original_df = df.copy()
-    cleaned_df, cleaning_summary, was_cleaned = auto_clean_data(df, processor)
-    st.session_state.data_processor = processor
+    st.markdown(_FEATURE_GRID, unsafe_allow_html=True)
+# The upload is hashed on every run so replacing the file is noticed; a new
+# hash reloads the data and drops everything derived from the previous file
+file_bytes = uploaded_file.getvalue() if uploaded_file else None
+df_key = hashlib.blake2b(file_bytes, digest_size=16).hexdigest() if file_bytes is not None else None
+if df_key is not None and df_key != st.session_state.df_key:
+    for key in ('active_view', 'execution_times', 'generated_report', 'frame_stats', 'analyses'):
+        value = SESSION_DEFAULTS[key]
+        st.session_state[key] = value.copy() if isinstance(value, dict) else value
+    st.session_state.df_key = df_key
+    df, cleaned_df, cleaning_summary, was_cleaned, frame_stats = load_and_clean(file_bytes, df_key)
+    st.session_state.original_df = df
+    st.session_state.data_processor = get_processor(file_bytes, df_key)
     st.session_state.current_df = cleaned_df
     st.session_state.cleaning_summary = cleaning_summary
     st.session_state.cleaning_performed = was_cleaned
+    st.session_state.frame_stats = frame_stats
     st.rerun()
 
 # -------------------- ACTION BUTTONS (AFTER UPLOAD) --------------------
@@ -375,45 +472,48 @@ if st.session_state.current_df is not None:
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         if st.button("📈 Summarize Trends", type="primary", use_container_width=True, key="btn_trends"):
-            st.session_state.show_trends = True
-            st.session_state.show_anomalies = False
-            st.session_state.show_actions = False
-            st.session_state.show_report = False
-            st.rerun()
+            st.session_state.active_view = 'trends'
     with col2:
         if st.button("🔍 Identify Anomalies", type="primary", use_container_width=True, key="btn_anomalies"):
-            st.session_state.show_trends = False
-            st.session_state.show_anomalies = True
-            st.session_state.show_actions = False
-            st.session_state.show_report = False
-            st.rerun()
+            st.session_state.active_view = 'anomalies'
     with col3:
         if st.button("💡 Suggest Business Actions", type="primary", use_container_width=True, key="btn_actions"):
-            st.session_state.show_trends = False
-            st.session_state.show_anomalies = False
-            st.session_state.show_actions = True
-            st.session_state.show_report = False
-            st.rerun()
+            st.session_state.active_view = 'actions'
     with col4:
         if st.button("📄 Generate AI Report", type="primary", use_container_width=True, key="btn_report"):
-            st.session_state.show_trends = False
-            st.session_state.show_anomalies = False
-            st.session_state.show_actions = False
-            st.session_state.show_report = True
-            st.rerun()
-
-# Process uploaded file
-if uploaded_file and st.session_state.data_processor is None:
-    processor = DataProcessor()
-    df = processor.load_data(uploaded_file)
-    st.session_state.original_df = df.copy()
-    cleaned_df, cleaning_summary, was_cleaned = auto_clean_data(df, processor)
-    st.session_state.data_processor = processor
-    st.session_state.current_df = cleaned_df
-    st.session_state.cleaning_summary = cleaning_summary
-    st.session_state.cleaning_performed = was_cleaned
+            st.session_state.active_view = 'report'
+
+@st.cache_data(show_spinner=False)
+def _metric_panel_html(fingerprint):
+    """Metric card HTML for (records, fields, missing %, quality score)"""
+    total_records, total_fields, missing_pct, quality_score = fingerprint
+    return f"""
+<div class="metric-container">
+    <div class="metric-card-styled">
+        <div class="metric-icon-box" style="color:#00ff88;">◈</div>
+        <p class="val-text">{total_records}</p>
+        <p class="label-text">Total Records</p>
+    </div>
+    <div class="metric-card-styled">
+        <div class="metric-icon-box" style="color:#00ff88;">◈</div>
+        <p class="val-text">{total_fields}</p>
+        <p class="label-text">Data Fields</p>
+    </div>
+    <div class="metric-card-styled">
+        <div class="metric-icon-box" style="color:#00ff88;">◈</div>
+        <p class="val-text">{missing_pct:.1f}%</p>
+        <p class="label-text">Missing Data</p>
+    </div>
+    <div class="metric-card-styled gold">
+        <div class="metric-icon-box" style="color:#f1c40f;"></div>
+        <p class="val-text">{quality_score:.0f}/100</p>
+        <p class="label-text">Quality Score</p>
+    </div>
+</div>
+"""
 
-    # Show cleaning summary
+# Show cleaning summary
+if st.session_state.get('cleaning_summary'):
     st.markdown("<div class='glass-card'><h4>Data Cleaning Summary</h4>", unsafe_allow_html=True)
     for line in st.session_state.cleaning_summary:
         st.markdown(f"- {line}", unsafe_allow_html=True)
@@ -426,276 +526,266 @@ if st.session_state.current_df is not None:
     total_records = len(df)
     total_fields = len(df.columns)
     
+    # Null and duplicate counts, computed once per dataset
+    if st.session_state.frame_stats is None:
+        st.session_state.frame_stats = _frame_stats(df)
+    _, null_cells, dup_count = st.session_state.frame_stats
+    
     # Calculate Missing Data %
-    total_cells = np.prod(df.shape)
-    null_cells = df.isnull().sum().sum()
+    total_cells = df.shape[0] * df.shape[1]
     missing_pct = (null_cells / total_cells) * 100 if total_cells > 0 else 0
     
     # Calculate Quality Score
     # (100 minus penalty for missing data and duplicates)
-    dup_pct = (df.duplicated().sum() / len(df)) * 100 if len(df) > 0 else 0
+    dup_pct = (dup_count / len(df)) * 100 if len(df) > 0 else 0
     quality_score = max(0, 100 - (missing_pct + dup_pct))
 
     # Display Styled Cards
-    st.markdown(f"""
-    <div class="metric-container">
-        <div class="metric-card-styled">
-            <div class="metric-icon-box" style="color:#00ff88;">◈</div>
-            <p class="val-text">{total_records}</p>
-            <p class="label-text">Total Records</p>
-        </div>
-        <div class="metric-card-styled">
-            <div class="metric-icon-box" style="color:#00ff88;">◈</div>
-            <p class="val-text">{total_fields}</p>
-            <p class="label-text">Data Fields</p>
-        </div>
-        <div class="metric-card-styled">
-            <div class="metric-icon-box" style="color:#00ff88;">◈</div>
-            <p class="val-text">{missing_pct:.1f}%</p>
-            <p class="label-text">Missing Data</p>
-        </div>
-        <div class="metric-card-styled gold">
-            <div class="metric-icon-box" style="color:#f1c40f;"></div>
-            <p class="val-text">{quality_score:.0f}/100</p>
-            <p class="label-text">Quality Score</p>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-# Main analysis output display
-if st.session_state.current_df is not None:
+    st.markdown(_metric_panel_html((total_records, total_fields, round(missing_pct, 1), round(quality_score))),
+                unsafe_allow_html=True)
+# Main analysis output display. Each view is a fragment: widgets inside it
+# (such as the report form) rerun only that view instead of the whole page.
+# 1. SUMMARIZE TRENDS OUTPUT
+TREND_EMOJI = {'increasing': "📈", 'decreasing': "📉"}
+
+@st.fragment
+def trends_view():
+    """Trend analysis output"""
+    if st.session_state.active_view != 'trends':
+        return
     
-    # 1. SUMMARIZE TRENDS OUTPUT
-    if st.session_state.show_trends:
-        start_time = time.time()
-        
-        with st.spinner("🔄 Analyzing trends and patterns..."):
-            df = st.session_state.current_df
-            processor = st.session_state.data_processor
-            trend_analyzer = TrendAnalyzer(df, processor.column_datatypes)
-            
-            trends = trend_analyzer.analyze_trends()
-            execution_time = time.time() - start_time
-            st.session_state.execution_times['trends'] = execution_time
-        
-        st.markdown(f"""<div class="output-section">
-        <h2>📈 Trend Analysis Report</h2>
-        <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
-        </div>""", unsafe_allow_html=True)
-       
-        
-        # Numeric trends
-        st.markdown("#### 🔢 Numeric Metrics Performance")
-        numeric_trends = trends['numeric_trends']
-        
-        if numeric_trends:
-            trend_data = []
-            for col, info in numeric_trends.items():
-                trend_emoji = "📈" if info['trend_direction'] == 'increasing' else "📉" if info['trend_direction'] == 'decreasing' else "➡️"
-                variability = "High 🔴" if info.get('coefficient_of_variation', 0) > 50 else "Low 🟢"
-                
-                trend_data.append({
-                    "Metric": col.replace('_', ' ').title(),
-                    "Average": f"{info['mean']:.2f}",
-                    "Range": f"{info['min']:.1f} - {info['max']:.1f}",
-                    "Trend": f"{trend_emoji} {info['trend_direction'].title()}",
-                    "Variability": variability
-                })
-            
-            st.dataframe(pd.DataFrame(trend_data), use_container_width=True, hide_index=True)
-            
-            # Key insights
-            st.markdown("<div class='analysis-heading'>💡 Key Insights</div>", unsafe_allow_html=True)
-            increasing = sum(1 for v in numeric_trends.values() if v['trend_direction'] == 'increasing')
-            decreasing = sum(1 for v in numeric_trends.values() if v['trend_direction'] == 'decreasing')
-            stable = sum(1 for v in numeric_trends.values() if v['trend_direction'] == 'stable')
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.success(f"✅ **{increasing} metrics showing growth** - positive momentum detected")
-                if decreasing > 0:
-                    st.warning(f"⚠️ **{decreasing} metrics declining** - may need attention")
-            with col2:
-                st.info(f"ℹ️ **{stable} metrics stable** - consistent performance")
-        
-        # Visualizations
-        st.markdown("#### 📊 Visual Analysis")
-        
-        fig1, insight1 = trend_analyzer.visualize_numeric_distributions(top_n=3)
-        if fig1:
-            st.plotly_chart(fig1, use_container_width=True)
-            with st.expander("📖 How to Read This Chart"):
-                st.info(insight1)
-        
-        fig2, insight2 = trend_analyzer.visualize_correlation_pie()
-        if fig2:
-            st.plotly_chart(fig2, use_container_width=True)
-            with st.expander("📖 How to Read This Chart"):
-                st.info(insight2)
-        
-        fig3, insight3 = trend_analyzer.visualize_categorical_distribution()
-        if fig3:
-            st.plotly_chart(fig3, use_container_width=True)
-            with st.expander("📖 How to Read This Chart"):
-                st.info(insight3)
-    
-    # 2. IDENTIFY ANOMALIES OUTPUT
-    elif st.session_state.show_anomalies:
-        start_time = time.time()
-        
-        with st.spinner("🔍 Detecting anomalies and data quality issues..."):
-            df = st.session_state.current_df
-            processor = st.session_state.data_processor
-            anomaly_detector = AnomalyDetector(df, processor.column_datatypes)
-            
-            anomalies = anomaly_detector.detect_all_anomalies()
-            execution_time = time.time() - start_time
-            st.session_state.execution_times['anomalies'] = execution_time
-        
-        st.markdown(f"""<div class="output-section">
-        <h2>🔍 Anomaly Detection Report</h2>
-        <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
-        </div>""", unsafe_allow_html=True)
-        
-        # Overall quality score
-        st.markdown("<div class='analysis-heading'>🎯 Overall Data Quality Score</div>", unsafe_allow_html=True)
-        fig_quality, insight_quality = anomaly_detector.visualize_data_quality_score()
-        if fig_quality:
-            col1, col2 = st.columns([1, 2])
-            with col1:
-                st.plotly_chart(fig_quality, use_container_width=True)
-            with col2:
-                st.markdown(insight_quality)
-        
-        st.markdown("---")
-        
-        # Outliers
-        st.markdown("<div class='analysis-heading'>🎯 Unusual Values (Outliers)</div>", unsafe_allow_html=True)
-        fig1, insight1 = anomaly_detector.visualize_outliers(top_n=3)
-        if fig1:
-            st.plotly_chart(fig1, use_container_width=True)
-            with st.expander("📖 What This Means"):
-                st.info(insight1)
-        else:
-            st.success(insight1)
-        
-        # Missing Data
-        st.markdown("<div class='analysis-heading'>❓ Missing Information</div>", unsafe_allow_html=True)
-        fig2, insight2 = anomaly_detector.visualize_missing_data()
-        if fig2:
-            st.plotly_chart(fig2, use_container_width=True)
-            with st.expander("📖 What This Means"):
-                st.info(insight2)
-        else:
-            st.success(insight2)
+    start_time = time.time()
+    
+    with st.spinner("🔄 Analyzing trends and patterns..."):
+        trend_analyzer, trends = session_analyses('trends')[0]
+        execution_time = time.time() - start_time
+        st.session_state.execution_times['trends'] = execution_time
+    
+    st.markdown(f"""<div class="output-section">
+    <h2>📈 Trend Analysis Report</h2>
+    <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
+    </div>""", unsafe_allow_html=True)
+   
+    
+    # Numeric trends
+    st.markdown("#### 🔢 Numeric Metrics Performance")
+    numeric_trends = trends['numeric_trends']
+    
+    if numeric_trends:
+        metrics, averages, ranges, directions, cvs = [], [], [], [], []
+        for col, info in numeric_trends.items():
+            metrics.append(col.replace('_', ' ').title())
+            averages.append(f"{info['mean']:.2f}")
+            ranges.append(f"{info['min']:.1f} - {info['max']:.1f}")
+            directions.append(info['trend_direction'])
+            cvs.append(info.get('coefficient_of_variation', 0))
+        
+        trend_data = {
+            "Metric": metrics,
+            "Average": averages,
+            "Range": ranges,
+            "Trend": [f"{TREND_EMOJI.get(d, '➡️')} {d.title()}" for d in directions],
+            "Variability": np.where(np.array(cvs, dtype=float) > 50, "High 🔴", "Low 🟢")
+        }
+        # Streamlit ships tables to the browser as Arrow, so build that directly
+        trend_table = pa.table(trend_data) if pa is not None else pd.DataFrame(trend_data)
+        st.dataframe(trend_table, use_container_width=True, hide_index=True)
+        
+        # Key insights
+        st.markdown("<div class='analysis-heading'>💡 Key Insights</div>", unsafe_allow_html=True)
+        direction_counts = Counter(directions)
+        increasing = direction_counts['increasing']
+        decreasing = direction_counts['decreasing']
+        stable = direction_counts['stable']
         
-        # Duplicates
-        st.markdown("<div class='analysis-heading'>📋 Duplicate Records</div>", unsafe_allow_html=True)
-        fig3, insight3 = anomaly_detector.visualize_duplicate_analysis()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.success(f"✅ **{increasing} metrics showing growth** - positive momentum detected")
+            if decreasing > 0:
+                st.warning(f"⚠️ **{decreasing} metrics declining** - may need attention")
+        with col2:
+            st.info(f"ℹ️ **{stable} metrics stable** - consistent performance")
+    
+    # Visualizations
+    st.markdown("#### 📊 Visual Analysis")
+    
+    fig1, insight1 = trend_analyzer.visualize_numeric_distributions(top_n=3)
+    if fig1:
+        st.plotly_chart(fig1, use_container_width=True)
+        with st.expander("📖 How to Read This Chart"):
+            st.info(insight1)
+    
+    fig2, insight2 = trend_analyzer.visualize_correlation_pie()
+    if fig2:
+        st.plotly_chart(fig2, use_container_width=True)
+        with st.expander("📖 How to Read This Chart"):
+            st.info(insight2)
+    
+    fig3, insight3 = trend_analyzer.visualize_categorical_distribution()
+    if fig3:
         st.plotly_chart(fig3, use_container_width=True)
-        with st.expander("📖 What This Means"):
+        with st.expander("📖 How to Read This Chart"):
             st.info(insight3)
-        
-        # Data Quality Issues Summary
-        st.markdown("<div class='analysis-heading'>⚠️ Data Quality Issues</div>", unsafe_allow_html=True)
-        quality_issues = anomalies['data_quality_issues']
-        
-        if quality_issues:
-            issues_found = []
-            if 'constant_columns' in quality_issues:
-                issues_found.append(f"🔴 **Constant Columns:** {', '.join(quality_issues['constant_columns'])} (all values are the same)")
-            if 'mostly_missing' in quality_issues:
-                issues_found.append(f"🔴 **Mostly Empty:** {', '.join(quality_issues['mostly_missing'])} (>70% missing)")
-            if 'high_cardinality' in quality_issues:
-                issues_found.append(f"🟡 **Too Many Unique Values:** {', '.join(quality_issues['high_cardinality'])}")
-            
-            for issue in issues_found:
-                st.warning(issue)
-        else:
-            st.success("✅ No major data quality issues detected!")
+
+
+# 2. IDENTIFY ANOMALIES OUTPUT
+@st.fragment
+def anomalies_view():
+    """Anomaly detection output"""
+    if st.session_state.active_view != 'anomalies':
+        return
     
-    # 3. SUGGEST BUSINESS ACTIONS OUTPUT
-    elif st.session_state.show_actions:
-        start_time = time.time()
-        
-        with st.spinner("💡 Generating actionable business recommendations..."):
-            df = st.session_state.current_df
-            processor = st.session_state.data_processor
-            trend_analyzer = TrendAnalyzer(df, processor.column_datatypes)
-            insight_generator = BusinessInsightGenerator(trend_analyzer)
-            
-            summary = insight_generator.generate_executive_summary()
-            actions = insight_generator.generate_business_actions()
-            top_3 = insight_generator.generate_top_3_insights()
-            
-            execution_time = time.time() - start_time
-            st.session_state.execution_times['actions'] = execution_time
+    start_time = time.time()
+    
+    with st.spinner("🔍 Detecting anomalies and data quality issues..."):
+        anomaly_detector, anomalies = session_analyses('anomalies')[0]
+        execution_time = time.time() - start_time
+        st.session_state.execution_times['anomalies'] = execution_time
+    
+    st.markdown(f"""<div class="output-section">
+    <h2>🔍 Anomaly Detection Report</h2>
+    <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
+    </div>""", unsafe_allow_html=True)
+    
+    # Overall quality score
+    st.markdown("<div class='analysis-heading'>🎯 Overall Data Quality Score</div>", unsafe_allow_html=True)
+    fig_quality, insight_quality = anomaly_detector.visualize_data_quality_score(anomalies)
+    if fig_quality:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            st.plotly_chart(fig_quality, use_container_width=True)
+        with col2:
+            st.markdown(insight_quality)
+    
+    st.markdown("---")
+    
+    # Outliers
+    st.markdown("<div class='analysis-heading'>🎯 Unusual Values (Outliers)</div>", unsafe_allow_html=True)
+    fig1, insight1 = anomaly_detector.visualize_outliers(top_n=3, outlier_info=anomalies['outliers'])
+    if fig1:
+        st.plotly_chart(fig1, use_container_width=True)
+        with st.expander("📖 What This Means"):
+            st.info(insight1)
+    else:
+        st.success(insight1)
+    
+    # Missing Data
+    st.markdown("<div class='analysis-heading'>❓ Missing Information</div>", unsafe_allow_html=True)
+    fig2, insight2 = anomaly_detector.visualize_missing_data(anomalies['missing_patterns'])
+    if fig2:
+        st.plotly_chart(fig2, use_container_width=True)
+        with st.expander("📖 What This Means"):
+            st.info(insight2)
+    else:
+        st.success(insight2)
+    
+    # Duplicates
+    st.markdown("<div class='analysis-heading'>📋 Duplicate Records</div>", unsafe_allow_html=True)
+    fig3, insight3 = anomaly_detector.visualize_duplicate_analysis(anomalies['duplicates'])
+    st.plotly_chart(fig3, use_container_width=True)
+    with st.expander("📖 What This Means"):
+        st.info(insight3)
+    
+    # Data Quality Issues Summary
+    st.markdown("<div class='analysis-heading'>⚠️ Data Quality Issues</div>", unsafe_allow_html=True)
+    quality_issues = anomalies['data_quality_issues']
+    
+    if quality_issues:
+        issues_found = []
+        if 'constant_columns' in quality_issues:
+            issues_found.append(f"🔴 **Constant Columns:** {', '.join(quality_issues['constant_columns'])} (all values are the same)")
+        if 'mostly_missing' in quality_issues:
+            issues_found.append(f"🔴 **Mostly Empty:** {', '.join(quality_issues['mostly_missing'])} (>70% missing)")
+        if 'high_cardinality' in quality_issues:
+            issues_found.append(f"🟡 **Too Many Unique Values:** {', '.join(quality_issues['high_cardinality'])}")
+        
+        for issue in issues_found:
+            st.warning(issue)
+    else:
+        st.success("✅ No major data quality issues detected!")
+
+
+# 3. SUGGEST BUSINESS ACTIONS OUTPUT
+@st.fragment
+def actions_view():
+    """Business action plan output"""
+    if st.session_state.active_view != 'actions':
+        return
+    
+    start_time = time.time()
+    
+    with st.spinner("💡 Generating actionable business recommendations..."):
+        insight_generator, summary, actions, top_3 = session_analyses('insights')[0]
         
-        st.markdown(f"""<div class="output-section">
-        <h2>💡 Business Action Plan</h2>
-        <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
-        </div>""", unsafe_allow_html=True)
+        execution_time = time.time() - start_time
+        st.session_state.execution_times['actions'] = execution_time
+    
+    st.markdown(f"""<div class="output-section">
+    <h2>💡 Business Action Plan</h2>
+    <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
+    </div>""", unsafe_allow_html=True)
 
-        # Executive Summary
-        st.markdown("<div class='analysis-heading'>📋 Executive Summary</div>", unsafe_allow_html=True)
+    # Executive Summary
+    st.markdown("<div class='analysis-heading'>📋 Executive Summary</div>", unsafe_allow_html=True)
 
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
 <div class="summary-dataset">
-    <strong>📊 Dataset Overview:</strong><br/>
-    - {summary['dataset_size']}<br/>
-    - Data Quality: <strong>{summary['data_quality']['score']}%</strong> {summary['data_quality']['grade']}
+<strong>📊 Dataset Overview:</strong><br/>
+- {summary['dataset_size']}<br/>
+- Data Quality: <strong>{summary['data_quality']['score']}%</strong> {summary['data_quality']['grade']}
 </div>
 <div class="summary-assessment">
-    <strong>💡 Assessment:</strong><br/>
-    {summary['data_quality']['recommendation']}
+<strong>💡 Assessment:</strong><br/>
+{summary['data_quality']['recommendation']}
 </div>
-            """, unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
 
-        with col2:
-            metrics_html = "<div class='summary-metrics'><strong>🎯 Key Metrics Status:</strong>"
-            metrics_html += "<ul style='margin:0.5rem 0 0 1rem; padding-left:1rem;'>"
-            for metric in summary['key_metrics'][:3]:
-                metrics_html += f"<li>• <strong>{metric['name']}</strong>: {metric['trend']} (Avg: {metric['average']})</li>"
-            metrics_html += "</ul></div>"
-            st.markdown(metrics_html, unsafe_allow_html=True)
-        
-        # Alerts (Immediate Attention) - All under one highlight
-        if summary['alerts']:
-            alerts_html = "<div class='summary-alerts'><strong>🚨 Immediate Attention Required:</strong><ul>"
-            for alert in summary['alerts']:
-                alerts_html += f"<li>{alert}</li>"
-            alerts_html += "</ul></div>"
-            st.markdown(alerts_html, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # TOP 3 PRIORITY ACTIONS
-        st.markdown("<div class='analysis-heading'>🎯 TOP 3 PRIORITY ACTIONS</div>", unsafe_allow_html=True)
-        
-        for i, action in enumerate(top_3, 1):
-            priority_color = "#dc3545" if "🔴" in action['Priority'] else "#ffc107" if "🟡" in action['Priority'] else "#28a745"
+    with col2:
+        metrics_html = "<div class='summary-metrics'><strong>🎯 Key Metrics Status:</strong>"
+        metrics_html += "<ul style='margin:0.5rem 0 0 1rem; padding-left:1rem;'>"
+        for metric in summary['key_metrics'][:3]:
+            metrics_html += f"<li>• <strong>{metric['name']}</strong>: {metric['trend']} (Avg: {metric['average']})</li>"
+        metrics_html += "</ul></div>"
+        st.markdown(metrics_html, unsafe_allow_html=True)
+    
+    # Alerts (Immediate Attention) - All under one highlight
+    if summary['alerts']:
+        alerts_html = "<div class='summary-alerts'><strong>🚨 Immediate Attention Required:</strong><ul>"
+        for alert in summary['alerts']:
+            alerts_html += f"<li>{alert}</li>"
+        alerts_html += "</ul></div>"
+        st.markdown(alerts_html, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # TOP 3 PRIORITY ACTIONS
+    st.markdown("<div class='analysis-heading'>🎯 TOP 3 PRIORITY ACTIONS</div>", unsafe_allow_html=True)
+    
+    for i, action in enumerate(top_3, 1):
+        priority_color = "#dc3545" if "🔴" in action['Priority'] else "#ffc107" if "🟡" in action['Priority'] else "#28a745"
+
+        with st.container():
+            st.markdown(f"""
+            <div style="border-left: 5px solid {priority_color}; padding: 1rem; margin: 1rem 0; background: linear-gradient(90deg,#071224 0%, #0b1630 100%); color: #e6f7ff; border-radius: 5px;">
+                <h3 style="margin: 0; color: {priority_color};">#{i}: {action['Action']}</h3>
+                <p style="margin: 0.5rem 0;"><strong>{action['Priority']}</strong> | {action['Category']}</p>
+            </div>
+            """, unsafe_allow_html=True)
 
-            with st.container():
+            col1, col2 = st.columns(2)
+            with col1:
                 st.markdown(f"""
-                <div style="border-left: 5px solid {priority_color}; padding: 1rem; margin: 1rem 0; background: linear-gradient(90deg,#071224 0%, #0b1630 100%); color: #e6f7ff; border-radius: 5px;">
-                    <h3 style="margin: 0; color: {priority_color};">#{i}: {action['Action']}</h3>
-                    <p style="margin: 0.5rem 0;"><strong>{action['Priority']}</strong> | {action['Category']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown(f"""
 **🎯 Why This Matters:**
 {action['Reason']}
 
 **💥 Business Impact:**
 {action['Impact']}
-                    """)
+                """)
 
-                with col2:
-                    st.markdown(f"""
+            with col2:
+                st.markdown(f"""
 **⚡ Quick Win (Immediate):**
 {action['Quick Win']}
 
@@ -704,149 +794,164 @@ if st.session_state.current_df is not None:
 
 **✨ Expected Benefit:**
 {action['Expected Benefit']}
-                    """)
+                """)
 
-                st.markdown(f"**👤 Owner:** {action['Owner']} | **⏰ Timeline:** {action['Timeline']}")
-                st.markdown("---")
-        
-        # All Actions Summary
-        st.markdown(f"<div class='analysis-heading'>📊 All Recommendations ({len(actions)} Total)</div>", unsafe_allow_html=True)
-        
-        critical = [a for a in actions if "🔴" in a['Priority']]
-        high = [a for a in actions if "🟡" in a['Priority']]
-        strategic = [a for a in actions if "🟢" in a['Priority']]
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("🔴 Critical Priority", len(critical))
-        with col2:
-            st.metric("🟡 High Priority", len(high))
-        with col3:
-            st.metric("🟢 Strategic Opportunities", len(strategic))
-        
-        with st.expander("📋 View All Recommendations"):
-            for action in actions:
-                st.markdown(f"""
+            st.markdown(f"**👤 Owner:** {action['Owner']} | **⏰ Timeline:** {action['Timeline']}")
+            st.markdown("---")
+    
+    # All Actions Summary
+    st.markdown(f"<div class='analysis-heading'>📊 All Recommendations ({len(actions)} Total)</div>", unsafe_allow_html=True)
+    
+    critical = [a for a in actions if "🔴" in a['Priority']]
+    high = [a for a in actions if "🟡" in a['Priority']]
+    strategic = [a for a in actions if "🟢" in a['Priority']]
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("🔴 Critical Priority", len(critical))
+    with col2:
+        st.metric("🟡 High Priority", len(high))
+    with col3:
+        st.metric("🟢 Strategic Opportunities", len(strategic))
+    
+    with st.expander("📋 View All Recommendations"):
+        for action in actions:
+            st.markdown(f"""
 **{action['Action']}** {action['Priority']}
 - **Category:** {action['Category']}
 - **Reason:** {action['Reason']}
 - **Quick Win:** {action['Quick Win']}
 - **Owner:** {action['Owner']}
-                """)
-                st.markdown("---")
-    
-    # 4. GENERATE AI REPORT OUTPUT (NEW!)
-    elif st.session_state.show_report:
-        start_time = time.time()
-        
-        st.markdown("### 📄 AI-Powered Report Generation")
-        
-        # Report type selection
-        col1, col2 = st.columns(2)
-        with col1:
-            report_type = st.selectbox(
-                "Report Type",
-                ["Executive Summary (1 page)", "Complete Business Report", "Technical Deep Dive"],
-                help="Choose the type of report you need"
-            )
-        
-        with col2:
-            include_charts = st.checkbox("Include Charts in Report", value=False, 
-                                        help="Embed visualizations (increases generation time)")
-        
-        if st.button("🤖 Generate AI Report Now", type="primary", use_container_width=True):
-            with st.spinner("🤖 AI is analyzing your data and writing your report... This may take 10-20 seconds"):
-                
-                df = st.session_state.current_df
-                processor = st.session_state.data_processor
-                
-                # Initialize analyzers
-                trend_analyzer = TrendAnalyzer(df, processor.column_datatypes)
-                anomaly_detector = AnomalyDetector(df, processor.column_datatypes)
-                insight_generator = BusinessInsightGenerator(trend_analyzer)
-                ai_report_gen = AIReportGenerator(trend_analyzer, anomaly_detector, insight_generator)
-                
-                # Generate report based on type
-                if report_type == "Executive Summary (1 page)":
-                    summary = insight_generator.generate_executive_summary()
-                    actions = insight_generator.generate_business_actions()
-                    report = ai_report_gen.generate_one_page_summary(summary, actions)
-                    st.session_state.generated_report = report
-                else:
-                    # Use fallback for now (can integrate actual API call here)
-                    summary = insight_generator.generate_executive_summary()
-                    actions = insight_generator.generate_business_actions()
-                    report = ai_report_gen._generate_fallback_report(summary, actions)
-                    st.session_state.generated_report = report
-                
-                execution_time = time.time() - start_time
-                st.session_state.execution_times['report'] = execution_time
-            
-            # Display report
-            st.markdown(f"""<div class="output-section">
-            <h2>📊 YOUR BUSINESS REPORT</h2>
-            <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
-            </div>""", unsafe_allow_html=True)
-            
-            st.markdown(f"*Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}*")
-            
-            # Show report
-            with st.expander("📖 Read Full Report", expanded=True):
-                st.markdown(st.session_state.generated_report)
-            
-            # Download buttons
-            st.markdown("### 💾 Download Your Report")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.download_button(
-                    label="📄 Download as Text",
-                    data=st.session_state.generated_report,
-                    file_name=f"business_report_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
-                    mime="text/plain"
-                )
-            
-            with col2:
-                st.download_button(
-                    label="📝 Download as Markdown",
-                    data=st.session_state.generated_report,
-                    file_name=f"business_report_{datetime.now().strftime('%Y%m%d_%H%M')}.md",
-                    mime="text/markdown"
-                )
-            
-            with col3:
-                generated_report_html = st.session_state.generated_report.replace("\n", "<br>")
-                html_report = f"""
+            """)
+            st.markdown("---")
+
+
+_HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
-    <meta charset="UTF-8">
-    <title>Business Report</title>
-    <style>
-        body {{ font-family: 'Segoe UI', Arial, sans-serif; max-width: 900px; margin: 40px auto; padding: 20px; line-height: 1.6; }}
-        h1 {{ color: #1f77b4; border-bottom: 3px solid #1f77b4; padding-bottom: 10px; }}
-        h2 {{ color: #2ca02c; margin-top: 30px; }}
-        .highlight {{ background: #fff3cd; padding: 15px; border-left: 4px solid #ffc107; margin: 20px 0; }}
-        .critical {{ background: #f8d7da; padding: 15px; border-left: 4px solid #dc3545; margin: 20px 0; }}
-    </style>
+<meta charset="UTF-8">
+<title>Business Report</title>
+<style>
+    body {{ font-family: 'Segoe UI', Arial, sans-serif; max-width: 900px; margin: 40px auto; padding: 20px; line-height: 1.6; }}
+    h1 {{ color: #1f77b4; border-bottom: 3px solid #1f77b4; padding-bottom: 10px; }}
+    h2 {{ color: #2ca02c; margin-top: 30px; }}
+    .highlight {{ background: #fff3cd; padding: 15px; border-left: 4px solid #ffc107; margin: 20px 0; }}
+    .critical {{ background: #f8d7da; padding: 15px; border-left: 4px solid #dc3545; margin: 20px 0; }}
+</style>
 </head>
 <body>
-{generated_report_html}
+{body}
 <hr>
-<p><small>Report Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br>
+<p><small>Report Generated: {ts}<br>
 Analysis Tool: REPORT-X</small></p>
 </body>
 </html>
-                """
-                st.download_button(
-                    label="🌐 Download as HTML",
-                    data=html_report,
-                    file_name=f"business_report_{datetime.now().strftime('%Y%m%d_%H%M')}.html",
-                    mime="text/html"
-                )
+"""
+
+@st.cache_data(show_spinner=False)
+def build_html_report(report_md, generated_at):
+    """Standalone HTML download for a generated report"""
+    # Proper markdown rendering when markdown-it-py is available
+    if MD is not None:
+        generated_report_html = MD.render(report_md)
+    else:
+        generated_report_html = report_md.replace("\n", "<br>")
+    return _HTML_TEMPLATE.format(body=generated_report_html, ts=generated_at)
+
+
+# 4. GENERATE AI REPORT OUTPUT (NEW!)
+@st.fragment
+def report_view():
+    """AI report generation output"""
+    if st.session_state.active_view != 'report':
+        return
+    
+    start_time = time.time()
+    
+    st.markdown("### 📄 AI-Powered Report Generation")
+    
+    # Report type selection
+    col1, col2 = st.columns(2)
+    with col1:
+        report_type = st.selectbox(
+            "Report Type",
+            ["Executive Summary (1 page)", "Complete Business Report", "Technical Deep Dive"],
+            help="Choose the type of report you need"
+        )
+    
+    with col2:
+        include_charts = st.checkbox("Include Charts in Report", value=False, 
+                                    help="Embed visualizations (increases generation time)")
+    
+    if st.button("🤖 Generate AI Report Now", type="primary", use_container_width=True):
+        with st.spinner("🤖 AI is analyzing your data and writing your report... This may take 10-20 seconds"):
+            
+            # Analyses run together first; the report text is re-rendered on each click
+            session_analyses('trends', 'anomalies', 'insights')
+            st.session_state.generated_report = get_report_text(
+                st.session_state.current_df, st.session_state.df_key,
+                tuple(st.session_state.data_processor.column_datatypes.items()), report_type)
             
-            st.success("✅ Report generated successfully! Use the buttons above to download in your preferred format.")
+            execution_time = time.time() - start_time
+            st.session_state.execution_times['report'] = execution_time
+        
+        # Display report
+        st.markdown(f"""<div class="output-section">
+        <h2>📊 YOUR BUSINESS REPORT</h2>
+        <span class="timer-badge">⚡ Generated in {execution_time:.2f} seconds</span>
+        </div>""", unsafe_allow_html=True)
+        
+        ts = datetime.now()
+        ts_file = ts.strftime('%Y%m%d_%H%M')
+        ts_disp = ts.strftime('%B %d, %Y at %I:%M %p')
+        st.markdown(f"*Generated on {ts_disp}*")
+        
+        # Show report
+        with st.expander("📖 Read Full Report", expanded=True):
+            st.markdown(st.session_state.generated_report)
+        
+        # Download buttons
+        st.markdown("### 💾 Download Your Report")
+        
+        # Encode each payload once; the text and markdown buttons share one
+        report_bytes = st.session_state.generated_report.encode('utf-8')
+        html_bytes = build_html_report(st.session_state.generated_report, ts_disp).encode('utf-8')
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.download_button(
+                label="📄 Download as Text",
+                data=report_bytes,
+                file_name=f"business_report_{ts_file}.txt",
+                mime="text/plain"
+            )
+        
+        with col2:
+            st.download_button(
+                label="📝 Download as Markdown",
+                data=report_bytes,
+                file_name=f"business_report_{ts_file}.md",
+                mime="text/markdown"
+            )
+        
+        with col3:
+            st.download_button(
+                label="🌐 Download as HTML",
+                data=html_bytes,
+                file_name=f"business_report_{ts_file}.html",
+                mime="text/html"
+            )
+        
+        st.success("✅ Report generated successfully! Use the buttons above to download in your preferred format.")
+
+
+if st.session_state.current_df is not None:
+    trends_view()
+    anomalies_view()
+    actions_view()
+    report_view()
     
     # Show performance summary
     if st.session_state.execution_times:
@@ -879,8 +984,3 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
-import os
-from chat_engine import ChatEngine
-
-api_key = os.getenv("OPENAI_API_KEY")  # This reads from environment variable)  # Reads the API key
-chat = ChatEngine(api_key)
@@ -1,4 +1,17 @@
+import functools
+import itertools
+import numpy as np
 import pandas as pd
+from data_processor import null_counts
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# Record layout of BusinessInsightGenerator.trends_array
+TRENDS_DTYPE = [('col', object), ('mean', np.float64), ('min', np.float64), ('max', np.float64),
+                ('cv', np.float64), ('direction', 'U20')]
 
 class BusinessInsightGenerator:
     """Generate actionable business insights from data analysis"""
@@ -6,166 +19,255 @@ class BusinessInsightGenerator:
     def __init__(self, trend_analyzer):
         self.trend_analyzer = trend_analyzer
     
-    def generate_business_actions(self):
-        """Generate comprehensive business-focused insights with priorities"""
-        actions = []
+    # The trend analyzer's results are reused by every report section, so each
+    # analysis runs once per generator
+    @functools.cached_property
+    def numeric_trends(self):
+        """Cached TrendAnalyzer._analyze_numeric_trends() result"""
+        return self.trend_analyzer._analyze_numeric_trends()
+    
+    @functools.cached_property
+    def cat_distributions(self):
+        """Cached TrendAnalyzer._analyze_categorical_distributions() result"""
+        return self.trend_analyzer._analyze_categorical_distributions()
+    
+    @functools.cached_property
+    def correlations(self):
+        """Cached TrendAnalyzer._analyze_correlations() result"""
+        return self.trend_analyzer._analyze_correlations()
+    
+    @functools.cached_property
+    def strong_positive_correlations(self):
+        """The 'strong positive' subset of correlations"""
+        return {pair: info for pair, info in self.correlations.items()
+                if info['strength'] == 'strong positive'}
+    
+    @functools.cached_property
+    def pretty_names(self):
+        """Display name ('unit_price' -> 'Unit Price') for every column"""
+        return {col: col.replace('_', ' ').title() for col in self.trend_analyzer.df.columns}
+    
+    @functools.cached_property
+    def frame_counts(self):
+        """Tuple of per-column null counts, total missing cells and duplicate row count"""
         df = self.trend_analyzer.df
-        total_rows = len(df)
-        
-        # 1. Critical: Missing Data Actions
-        missing_pct = (df.isnull().sum() / total_rows) * 100
-        for col, pct in missing_pct.items():
-            if pct > 30:
-                actions.append({
-                    "Category": "🚨 Data Quality Crisis",
-                    "Action": f"Urgently fix data collection for '{col.replace('_', ' ').title()}'",
-                    "Reason": f"{pct:.1f}% missing means nearly 1 in 3 records lack this information",
-                    "Impact": "Critical - Your reports and decisions based on this field are unreliable",
-                    "Quick Win": f"Make '{col}' a mandatory field in your data entry system TODAY",
-                    "Long Term": "Train staff on importance of complete data entry",
-                    "Expected Benefit": "Reliable analysis and confident decision-making",
-                    "Priority": "🔴 Critical Priority",
-                    "Owner": "Data Team / Operations Lead",
-                    "Timeline": "Fix within 1 week"
-                })
-            elif pct > 10:
-                actions.append({
-                    "Category": "⚠️ Data Quality Issue",
-                    "Action": f"Improve completeness of '{col.replace('_', ' ').title()}' field",
-                    "Reason": f"{pct:.1f}% missing suggests inconsistent data capture",
-                    "Impact": "Medium - Gaps in data limit analysis accuracy",
-                    "Quick Win": "Add validation rules and helpful prompts at data entry",
-                    "Long Term": "Review and update data collection procedures",
-                    "Expected Benefit": "More complete data for better insights",
-                    "Priority": "🟡 High Priority",
-                    "Owner": "Operations Manager",
-                    "Timeline": "Fix within 2-4 weeks"
-                })
+        col_nulls = pd.Series(null_counts(df), index=df.columns)
+        return col_nulls, col_nulls.sum(), df.duplicated().sum()
+    
+    @functools.cached_property
+    def trends_array(self):
+        """numeric_trends as a structured array, one record per metric"""
+        return np.array(
+            [(col, info['mean'], info['min'], info['max'],
+              info.get('coefficient_of_variation', 0), info['trend_direction'])
+             for col, info in self.numeric_trends.items()],
+            dtype=TRENDS_DTYPE
+        )
+    
+    @functools.cached_property
+    def missing_bands(self):
+        """Missing percentage per column and its band (2: >30%, 1: 10-30%, 0: below)"""
+        col_nulls, _, _ = self.frame_counts
+        missing_pct = (col_nulls / len(self.trend_analyzer.df)) * 100
+        pct = missing_pct.to_numpy(dtype=np.float64)
+        # numexpr classifies both bands in one pass without temporaries
+        if ne is not None:
+            codes = ne.evaluate("where(pct > 30, 2, where(pct > 10, 1, 0))")
+        else:
+            codes = np.where(pct > 30, 2, np.where(pct > 10, 1, 0))
+        return missing_pct, codes
+    
+    # Each action section is a generator of one priority level, so callers
+    # that only need the first few actions stop before building the rest
+    def _missing_data_crisis_actions(self):
+        """Critical: fields missing more than 30% of their values"""
+        missing_pct, codes = self.missing_bands
+        for col, pct in missing_pct.iloc[np.flatnonzero(codes == 2)].items():
+            yield {
+                "Category": "🚨 Data Quality Crisis",
+                "Action": f"Urgently fix data collection for '{self.pretty_names[col]}'",
+                "Reason": f"{pct:.1f}% missing means nearly 1 in 3 records lack this information",
+                "Impact": "Critical - Your reports and decisions based on this field are unreliable",
+                "Quick Win": f"Make '{col}' a mandatory field in your data entry system TODAY",
+                "Long Term": "Train staff on importance of complete data entry",
+                "Expected Benefit": "Reliable analysis and confident decision-making",
+                "Priority": "🔴 Critical Priority",
+                "Owner": "Data Team / Operations Lead",
+                "Timeline": "Fix within 1 week"
+            }
+    
+    def _missing_data_issue_actions(self):
+        """High: fields missing 10-30% of their values"""
+        missing_pct, codes = self.missing_bands
+        for col, pct in missing_pct.iloc[np.flatnonzero(codes == 1)].items():
+            yield {
+                "Category": "⚠️ Data Quality Issue",
+                "Action": f"Improve completeness of '{self.pretty_names[col]}' field",
+                "Reason": f"{pct:.1f}% missing suggests inconsistent data capture",
+                "Impact": "Medium - Gaps in data limit analysis accuracy",
+                "Quick Win": "Add validation rules and helpful prompts at data entry",
+                "Long Term": "Review and update data collection procedures",
+                "Expected Benefit": "More complete data for better insights",
+                "Priority": "🟡 High Priority",
+                "Owner": "Operations Manager",
+                "Timeline": "Fix within 2-4 weeks"
+            }
+    
+    @functools.cached_property
+    def metric_groups(self):
+        """Columns grouped by the action they trigger, from one pass over each analysis"""
+        groups = {"volatile": [], "declining": [], "growing": [], "planning": [],
+                  "concentrated": [], "balanced": []}
         
-        # 2. High Risk: Variability Warnings
-        numeric_trends = self.trend_analyzer._analyze_numeric_trends()
-        for col, info in numeric_trends.items():
+        for col, info in self.numeric_trends.items():
             cv = info.get("coefficient_of_variation", 0)
             if cv > 100:
-                actions.append({
-                    "Category": "⚠️ High Risk Alert",
-                    "Action": f"Investigate extreme swings in '{col.replace('_', ' ').title()}'",
-                    "Reason": f"Values fluctuate wildly (variation of {cv:.0f}%) - either data errors or business volatility",
-                    "Impact": "High - Unpredictable metrics make planning impossible",
-                    "Quick Win": "Review top and bottom 10 values for obvious data entry errors",
-                    "Long Term": "Implement data validation rules to prevent outlier entries",
-                    "Expected Benefit": "Stable, trustworthy metrics for forecasting",
-                    "Priority": "🔴 Critical Priority",
-                    "Owner": "Data Quality Team / Finance",
-                    "Timeline": "Investigate within 3 days"
-                })
-        
-        # 3. Urgent: Declining Business Metrics
-        for col, info in numeric_trends.items():
-            if info["trend_direction"] == "decreasing":
-                avg_decline = ((info['mean'] - info['median']) / info['mean'] * 100) if info['mean'] != 0 else 0
-                actions.append({
-                    "Category": "📉 Performance Alert",
-                    "Action": f"Address declining performance in '{col.replace('_', ' ').title()}'",
-                    "Reason": f"Recent values significantly lower than historical average",
-                    "Impact": "Critical - Declining trend indicates potential business problem",
-                    "Quick Win": "Hold emergency meeting with team to identify root cause",
-                    "Long Term": "Develop action plan to reverse the decline",
-                    "Expected Benefit": "Stop revenue/performance loss, return to growth",
-                    "Priority": "🔴 Critical Priority",
-                    "Owner": "Department Head / Management",
-                    "Timeline": "Meet within 48 hours"
-                })
-        
-        # 4. Opportunity: Growth Trends
-        for col, info in numeric_trends.items():
-            if info["trend_direction"] == "increasing":
-                actions.append({
-                    "Category": "📈 Growth Opportunity",
-                    "Action": f"Double down on success in '{col.replace('_', ' ').title()}'",
-                    "Reason": f"Strong upward trend shows what's working well",
-                    "Impact": "High Potential - Opportunity to accelerate growth",
-                    "Quick Win": "Analyze what's driving growth and document best practices",
-                    "Long Term": "Allocate more resources to replicate success in other areas",
-                    "Expected Benefit": "Accelerated growth and competitive advantage",
-                    "Priority": "🟢 Strategic Opportunity",
-                    "Owner": "Strategy Team / Business Development",
-                    "Timeline": "Capitalize within 1 month"
-                })
+                groups["volatile"].append((col, cv))
+            direction = info["trend_direction"]
+            if direction == "decreasing":
+                groups["declining"].append(col)
+            elif direction == "increasing":
+                groups["growing"].append(col)
+            elif direction == "stable" and cv < 10:
+                groups["planning"].append(col)
         
-        # 5. Planning: Stable Metrics for Forecasting
-        for col, info in numeric_trends.items():
-            if info["trend_direction"] == "stable" and info.get("coefficient_of_variation", 0) < 10:
-                actions.append({
-                    "Category": "📊 Planning Asset",
-                    "Action": f"Use '{col.replace('_', ' ').title()}' as forecasting baseline",
-                    "Reason": f"Highly stable and predictable values (variation < 10%)",
-                    "Impact": "Medium - Improves planning accuracy",
-                    "Quick Win": "Build next quarter's forecast using this reliable metric",
-                    "Long Term": "Develop KPI dashboard featuring stable metrics",
-                    "Expected Benefit": "More accurate forecasts and budgets",
-                    "Priority": "🟢 Strategic Opportunity",
-                    "Owner": "Planning / Finance Team",
-                    "Timeline": "Implement within 2 weeks"
-                })
-        
-        # 6. Risk Management: Concentration Issues
-        cat_distributions = self.trend_analyzer._analyze_categorical_distributions()
-        for col, info in cat_distributions.items():
+        for col, info in self.cat_distributions.items():
             concentration = info.get("concentration", 0)
             if concentration > 70:
-                actions.append({
-                    "Category": "⚠️ Concentration Risk",
-                    "Action": f"Diversify beyond '{info['most_common']}' in {col.replace('_', ' ').title()}",
-                    "Reason": f"Over-reliance on one category ({concentration:.1f}% concentration) creates vulnerability",
-                    "Impact": "High Risk - Single point of failure could devastate business",
-                    "Quick Win": "Identify 2-3 alternative categories to develop immediately",
-                    "Long Term": "Set target: No single category should exceed 40% within 6 months",
-                    "Expected Benefit": "Reduced risk, more stable revenue streams",
-                    "Priority": "🟡 High Priority",
-                    "Owner": "Business Development / Sales",
-                    "Timeline": "Start diversification within 2 weeks"
-                })
+                groups["concentrated"].append((col, concentration))
             elif concentration < 20:
-                actions.append({
-                    "Category": "✅ Balanced Portfolio",
-                    "Action": f"Maintain diversity in '{col.replace('_', ' ').title()}'",
-                    "Reason": f"Excellent balance across categories (top category only {concentration:.1f}%)",
-                    "Impact": "Positive - Reduced risk from diversification",
-                    "Quick Win": "Document what enabled this balance as best practice",
-                    "Long Term": "Use this as model for other business areas",
-                    "Expected Benefit": "Continued stable, resilient performance",
-                    "Priority": "🟢 Strategic Opportunity",
-                    "Owner": "Strategy Team",
-                    "Timeline": "Document within 1 week"
-                })
-        
-        # 7. Strategic: Leverage Correlations
-        correlations = self.trend_analyzer._analyze_correlations()
-        for pair, info in correlations.items():
-            if info['strength'] == 'strong positive':
-                actions.append({
-                    "Category": "🔗 Strategic Insight",
-                    "Action": f"Leverage relationship between {pair}",
-                    "Reason": f"Strong correlation ({info['coefficient']:.2f}) means they move together predictably",
-                    "Impact": "Medium - Can use one to predict the other",
-                    "Quick Win": "Use leading indicator to forecast lagging metric",
-                    "Long Term": "Build predictive model using this relationship",
-                    "Expected Benefit": "Earlier warnings and better forecasting",
-                    "Priority": "🟢 Strategic Opportunity",
-                    "Owner": "Analytics / Data Science Team",
-                    "Timeline": "Build model within 3-4 weeks"
-                })
+                groups["balanced"].append((col, concentration))
         
-        # 8. Foundation: Overall Data Quality Initiative
+        return groups
+    
+    def _volatility_actions(self):
+        """Critical: metrics whose coefficient of variation exceeds 100%"""
+        for col, cv in self.metric_groups["volatile"]:
+            yield {
+                "Category": "⚠️ High Risk Alert",
+                "Action": f"Investigate extreme swings in '{self.pretty_names[col]}'",
+                "Reason": f"Values fluctuate wildly (variation of {cv:.0f}%) - either data errors or business volatility",
+                "Impact": "High - Unpredictable metrics make planning impossible",
+                "Quick Win": "Review top and bottom 10 values for obvious data entry errors",
+                "Long Term": "Implement data validation rules to prevent outlier entries",
+                "Expected Benefit": "Stable, trustworthy metrics for forecasting",
+                "Priority": "🔴 Critical Priority",
+                "Owner": "Data Quality Team / Finance",
+                "Timeline": "Investigate within 3 days"
+            }
+    
+    def _decline_actions(self):
+        """Critical: metrics trending down"""
+        for col in self.metric_groups["declining"]:
+            yield {
+                "Category": "📉 Performance Alert",
+                "Action": f"Address declining performance in '{self.pretty_names[col]}'",
+                "Reason": f"Recent values significantly lower than historical average",
+                "Impact": "Critical - Declining trend indicates potential business problem",
+                "Quick Win": "Hold emergency meeting with team to identify root cause",
+                "Long Term": "Develop action plan to reverse the decline",
+                "Expected Benefit": "Stop revenue/performance loss, return to growth",
+                "Priority": "🔴 Critical Priority",
+                "Owner": "Department Head / Management",
+                "Timeline": "Meet within 48 hours"
+            }
+    
+    def _growth_actions(self):
+        """Strategic: metrics trending up"""
+        for col in self.metric_groups["growing"]:
+            yield {
+                "Category": "📈 Growth Opportunity",
+                "Action": f"Double down on success in '{self.pretty_names[col]}'",
+                "Reason": f"Strong upward trend shows what's working well",
+                "Impact": "High Potential - Opportunity to accelerate growth",
+                "Quick Win": "Analyze what's driving growth and document best practices",
+                "Long Term": "Allocate more resources to replicate success in other areas",
+                "Expected Benefit": "Accelerated growth and competitive advantage",
+                "Priority": "🟢 Strategic Opportunity",
+                "Owner": "Strategy Team / Business Development",
+                "Timeline": "Capitalize within 1 month"
+            }
+    
+    def _planning_actions(self):
+        """Strategic: stable, low-variation metrics usable as a forecast baseline"""
+        for col in self.metric_groups["planning"]:
+            yield {
+                "Category": "📊 Planning Asset",
+                "Action": f"Use '{self.pretty_names[col]}' as forecasting baseline",
+                "Reason": f"Highly stable and predictable values (variation < 10%)",
+                "Impact": "Medium - Improves planning accuracy",
+                "Quick Win": "Build next quarter's forecast using this reliable metric",
+                "Long Term": "Develop KPI dashboard featuring stable metrics",
+                "Expected Benefit": "More accurate forecasts and budgets",
+                "Priority": "🟢 Strategic Opportunity",
+                "Owner": "Planning / Finance Team",
+                "Timeline": "Implement within 2 weeks"
+            }
+    
+    def _concentration_risk_actions(self):
+        """High: categories dominated by a single value"""
+        for col, concentration in self.metric_groups["concentrated"]:
+            info = self.cat_distributions[col]
+            yield {
+                "Category": "⚠️ Concentration Risk",
+                "Action": f"Diversify beyond '{info['most_common']}' in {self.pretty_names[col]}",
+                "Reason": f"Over-reliance on one category ({concentration:.1f}% concentration) creates vulnerability",
+                "Impact": "High Risk - Single point of failure could devastate business",
+                "Quick Win": "Identify 2-3 alternative categories to develop immediately",
+                "Long Term": "Set target: No single category should exceed 40% within 6 months",
+                "Expected Benefit": "Reduced risk, more stable revenue streams",
+                "Priority": "🟡 High Priority",
+                "Owner": "Business Development / Sales",
+                "Timeline": "Start diversification within 2 weeks"
+            }
+    
+    def _balanced_portfolio_actions(self):
+        """Strategic: well-spread categories"""
+        for col, concentration in self.metric_groups["balanced"]:
+            yield {
+                "Category": "✅ Balanced Portfolio",
+                "Action": f"Maintain diversity in '{self.pretty_names[col]}'",
+                "Reason": f"Excellent balance across categories (top category only {concentration:.1f}%)",
+                "Impact": "Positive - Reduced risk from diversification",
+                "Quick Win": "Document what enabled this balance as best practice",
+                "Long Term": "Use this as model for other business areas",
+                "Expected Benefit": "Continued stable, resilient performance",
+                "Priority": "🟢 Strategic Opportunity",
+                "Owner": "Strategy Team",
+                "Timeline": "Document within 1 week"
+            }
+    
+    def _correlation_actions(self):
+        """Strategic: strongly positively correlated metric pairs"""
+        for pair, info in self.strong_positive_correlations.items():
+            yield {
+                "Category": "🔗 Strategic Insight",
+                "Action": f"Leverage relationship between {pair}",
+                "Reason": f"Strong correlation ({info['coefficient']:.2f}) means they move together predictably",
+                "Impact": "Medium - Can use one to predict the other",
+                "Quick Win": "Use leading indicator to forecast lagging metric",
+                "Long Term": "Build predictive model using this relationship",
+                "Expected Benefit": "Earlier warnings and better forecasting",
+                "Priority": "🟢 Strategic Opportunity",
+                "Owner": "Analytics / Data Science Team",
+                "Timeline": "Build model within 3-4 weeks"
+            }
+    
+    def _governance_quality_score(self):
+        """Completeness less a duplicate penalty, for the governance actions"""
+        df = self.trend_analyzer.df
+        total_rows = len(df)
+        _, missing_cells, duplicate_rows = self.frame_counts
         total_cells = total_rows * len(df.columns)
-        missing_cells = df.isnull().sum().sum()
-        duplicate_rows = df.duplicated().sum()
         quality_score = ((total_cells - missing_cells) / total_cells) * 100
         quality_score -= (duplicate_rows / total_rows) * 10
-        
+        return quality_score
+    
+    def _governance_crisis_actions(self):
+        """Critical: overall quality score below 80"""
+        quality_score = self._governance_quality_score()
         if quality_score < 80:
-            actions.append({
+            yield {
                 "Category": "🚨 Data Governance Crisis",
                 "Action": "Launch comprehensive data quality improvement program",
                 "Reason": f"Overall data quality score is {quality_score:.1f}% (minimum acceptable: 80%)",
@@ -176,9 +278,13 @@ class BusinessInsightGenerator:
                 "Priority": "🔴 Critical Priority",
                 "Owner": "Chief Data Officer / Senior Leadership",
                 "Timeline": "Kickoff within 1 week"
-            })
-        elif quality_score >= 90:
-            actions.append({
+            }
+    
+    def _data_excellence_actions(self):
+        """Strategic: overall quality score of 90 or more"""
+        quality_score = self._governance_quality_score()
+        if quality_score >= 90:
+            yield {
                 "Category": "✅ Data Excellence",
                 "Action": "Maintain and showcase data quality standards",
                 "Reason": f"Outstanding data quality score of {quality_score:.1f}%",
@@ -189,42 +295,59 @@ class BusinessInsightGenerator:
                 "Priority": "🟢 Strategic Opportunity",
                 "Owner": "Data Team Lead",
                 "Timeline": "Document within 2 weeks"
-            })
-        
-        # Sort by priority (Critical → High → Strategic)
-        priority_order = {
-            "🔴 Critical Priority": 0, 
-            "🟡 High Priority": 1, 
-            "🟢 Strategic Opportunity": 2
-        }
-        actions.sort(key=lambda x: priority_order.get(x["Priority"], 3))
-        
-        return actions
+            }
+    
+    def _urgent_actions(self):
+        """Critical actions followed by high-priority ones"""
+        return itertools.chain(
+            self._missing_data_crisis_actions(),
+            self._volatility_actions(),
+            self._decline_actions(),
+            self._governance_crisis_actions(),
+            self._missing_data_issue_actions(),
+            self._concentration_risk_actions()
+        )
+    
+    def _strategic_actions(self):
+        """Strategic opportunities"""
+        return itertools.chain(
+            self._growth_actions(),
+            self._planning_actions(),
+            self._balanced_portfolio_actions(),
+            self._correlation_actions(),
+            self._data_excellence_actions()
+        )
+    
+    def generate_business_actions(self):
+        """Generate comprehensive business-focused insights with priorities"""
+        # Each section yields a single priority and the bucket generators
+        # chain them Critical → High → Strategic (section order within a
+        # bucket), so the list comes out already sorted
+        return list(itertools.chain(self._urgent_actions(), self._strategic_actions()))
     
     def generate_executive_summary(self):
         """Generate executive summary with clear business language"""
         df = self.trend_analyzer.df
-        numeric_trends = self.trend_analyzer._analyze_numeric_trends()
-        cat_distributions = self.trend_analyzer._analyze_categorical_distributions()
+        trends = self.trends_array
+        cat_distributions = self.cat_distributions
+        col_nulls, total_missing, duplicate_rows = self.frame_counts
         
         summary = {
             "dataset_size": f"{len(df):,} records covering {len(df.columns)} different measurements",
-            "data_quality": self._calculate_quality_score(df),
-            "key_metrics": self._identify_key_metrics(numeric_trends),
-            "alerts": self._identify_alerts(numeric_trends, df),
-            "opportunities": self._identify_opportunities(numeric_trends, cat_distributions)
+            "data_quality": self._calculate_quality_score(len(df), len(df.columns), total_missing, duplicate_rows),
+            "key_metrics": self._identify_key_metrics(trends),
+            "alerts": self._identify_alerts(trends, col_nulls, len(df), duplicate_rows),
+            "opportunities": self._identify_opportunities(trends, cat_distributions)
         }
         
         return summary
     
-    def _calculate_quality_score(self, df):
+    def _calculate_quality_score(self, total_rows, total_cols, total_missing, dup_count):
         """Calculate overall data quality score with grades"""
-        total_cells = len(df) * len(df.columns)
-        missing_cells = df.isnull().sum().sum()
-        duplicate_rows = df.duplicated().sum()
+        total_cells = total_rows * total_cols
         
-        completeness = ((total_cells - missing_cells) / total_cells) * 100
-        uniqueness = ((len(df) - duplicate_rows) / len(df)) * 100
+        completeness = ((total_cells - total_missing) / total_cells) * 100
+        uniqueness = ((total_rows - dup_count) / total_rows) * 100
         
         overall_score = (completeness * 0.6 + uniqueness * 0.4)
         
@@ -252,67 +375,70 @@ class BusinessInsightGenerator:
             "recommendation": recommendation
         }
     
-    def _identify_key_metrics(self, numeric_trends):
+    def _identify_key_metrics(self, trends):
         """Identify most important metrics with business context"""
         key_metrics = []
         
-        for col, info in list(numeric_trends.items())[:3]:
-            variability = "High" if info.get('coefficient_of_variation', 0) > 50 else "Low"
-            trend_symbol = "📈" if info['trend_direction'] == 'increasing' else "📉" if info['trend_direction'] == 'decreasing' else "➡️"
+        for rec in trends[:3]:
+            direction = str(rec['direction'])
+            variability = "High" if rec['cv'] > 50 else "Low"
+            trend_symbol = "📈" if direction == 'increasing' else "📉" if direction == 'decreasing' else "➡️"
             
             key_metrics.append({
-                "name": col.replace('_', ' ').title(),
-                "average": round(info['mean'], 2),
-                "trend": f"{trend_symbol} {info['trend_direction'].title()}",
+                "name": self.pretty_names[rec['col']],
+                "average": round(float(rec['mean']), 2),
+                "trend": f"{trend_symbol} {direction.title()}",
                 "variability": variability,
-                "range": f"{info['min']:.1f} to {info['max']:.1f}"
+                "range": f"{rec['min']:.1f} to {rec['max']:.1f}"
             })
         
         return key_metrics
     
-    def _identify_alerts(self, numeric_trends, df):
+    def _identify_alerts(self, trends, col_nulls, total_rows, duplicate_rows):
         """Identify urgent issues requiring immediate attention"""
         alerts = []
+        dirs, cvs = trends['direction'], trends['cv']
         
         # Check for declining trends
-        declining_count = sum(1 for info in numeric_trends.values() if info['trend_direction'] == 'decreasing')
+        declining_count = int((dirs == 'decreasing').sum())
         if declining_count > 0:
             alerts.append(f"🚨 {declining_count} metric(s) showing decline - requires immediate investigation")
         
         # Check for high variability
-        volatile_count = sum(1 for info in numeric_trends.values() if info.get('coefficient_of_variation', 0) > 100)
+        volatile_count = int((cvs > 100).sum())
         if volatile_count > 0:
             alerts.append(f"⚠️ {volatile_count} metric(s) highly volatile - check for data quality issues")
         
         # Check for excessive missing data
-        high_missing = sum(1 for col in df.columns if df[col].isnull().sum() / len(df) > 0.3)
+        high_missing = int((col_nulls / total_rows > 0.3).sum())
         if high_missing > 0:
             alerts.append(f"⚠️ {high_missing} field(s) missing >30% of data - impacts analysis reliability")
         
         # Check for duplicates
-        dup_pct = (df.duplicated().sum() / len(df)) * 100
+        dup_pct = (duplicate_rows / total_rows) * 100
         if dup_pct > 5:
             alerts.append(f"⚠️ {dup_pct:.1f}% duplicate records detected - may inflate results")
         
         return alerts if alerts else ["✅ No urgent issues detected - data looks healthy"]
     
-    def _identify_opportunities(self, numeric_trends, cat_distributions):
+    def _identify_opportunities(self, trends, cat_distributions):
         """Identify growth opportunities and positive trends"""
         opportunities = []
+        dirs, cvs = trends['direction'], trends['cv']
+        concentration = np.array([info.get('concentration', 100) for info in cat_distributions.values()], dtype=np.float64)
         
         # Check for growing metrics
-        growing_count = sum(1 for info in numeric_trends.values() if info['trend_direction'] == 'increasing')
+        growing_count = int((dirs == 'increasing').sum())
         if growing_count > 0:
             opportunities.append(f"📈 {growing_count} metric(s) growing - identify and replicate success factors")
         
         # Check for stable predictable metrics
-        stable_count = sum(1 for info in numeric_trends.values() 
-                          if info['trend_direction'] == 'stable' and info.get('coefficient_of_variation', 0) < 10)
+        stable_count = int(((dirs == 'stable') & (cvs < 10)).sum())
         if stable_count > 0:
             opportunities.append(f"📊 {stable_count} stable metric(s) - excellent for reliable forecasting")
         
         # Check for balanced distributions
-        balanced_count = sum(1 for info in cat_distributions.values() if info.get('concentration', 100) < 30)
+        balanced_count = int((concentration < 30).sum())
         if balanced_count > 0:
             opportunities.append(f"✅ {balanced_count} well-diversified category - reduced concentration risk")
         
@@ -320,14 +446,11 @@ class BusinessInsightGenerator:
     
     def generate_top_3_insights(self):
         """Generate the top 3 most important business insights"""
-        actions = self.generate_business_actions()
-        
-        # Get top 3 critical/high priority items
-        top_actions = [a for a in actions if a['Priority'] in ['🔴 Critical Priority', '🟡 High Priority']][:3]
+        # Get top 3 critical/high priority items, generating no more than needed
+        top_actions = list(itertools.islice(self._urgent_actions(), 3))
         
         if len(top_actions) < 3:
             # Add strategic opportunities if needed
-            strategic = [a for a in actions if a['Priority'] == '🟢 Strategic Opportunity']
-            top_actions.extend(strategic[:3-len(top_actions)])
+            top_actions.extend(itertools.islice(self._strategic_actions(), 3 - len(top_actions)))
         
         return top_actions
\ No newline at end of file
@@ -1,8 +1,156 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
+import codecs
+import csv
+import re
+import warnings
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+try:
+    import numba
+    from numba import njit, prange
+    # Streamlit launches the kernels from its script thread; a TBB pool first
+    # started off the main thread keeps the interpreter from exiting, so use
+    # OpenMP when it is available
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+except ImportError:
+    njit = None
+
+# clean_data works on shallow copies and relies on Copy-on-Write, which is
+# always on from pandas 3 and has to be switched on before it (setting the
+# option on pandas 3 only raises a deprecation warning)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _null_count_scan(mask, out):
+        """Count the True cells of each column of a boolean null mask"""
+        for j in prange(mask.shape[1]):
+            cnt = 0
+            for i in range(mask.shape[0]):
+                if mask[i, j]:
+                    cnt += 1
+            out[j] = cnt
+
+    @njit(parallel=True, cache=True)
+    def _outlier_any_scan(arr, lower, upper, out):
+        """Flag columns with a value outside their bounds, stopping at the first one"""
+        for j in prange(arr.shape[1]):
+            lo = lower[j]
+            hi = upper[j]
+            found = False
+            for i in range(arr.shape[0]):
+                v = arr[i, j]
+                if v < lo or v > hi:
+                    found = True
+                    break
+            out[j] = found
+else:
+    _null_count_scan = None
+    _outlier_any_scan = None
+
+
+# Masks with more rows than this are counted by the compiled scan when numba
+# is installed. The kernel is compiled on its first such call, so small uploads
+# and the landing page never pay for it.
+_NULL_SCAN_MIN_ROWS = 100_000
+
+def null_counts(df):
+    """Per-column null counts as an ndarray, from a single null mask"""
+    mask = df.isna().to_numpy()
+    if _null_count_scan is None or mask.shape[0] <= _NULL_SCAN_MIN_ROWS:
+        return mask.sum(axis=0)
+    out = np.empty(mask.shape[1], dtype=np.int64)
+    # One memory layout, so the kernel is only ever compiled once
+    _null_count_scan(np.asfortranarray(mask), out)
+    return out
+
+# Common date layouts, tried on a sample before parsing a whole column with an
+# explicit format instead of letting pandas infer one
+_DATE_FORMATS = [
+    (re.compile(r'\d{4}-\d{2}-\d{2}'), '%Y-%m-%d'),
+    (re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'), '%Y-%m-%d %H:%M:%S'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}'), '%Y-%m-%dT%H:%M:%S'),
+    (re.compile(r'\d{4}/\d{2}/\d{2}'), '%Y/%m/%d'),
+    (re.compile(r'\d{2}/\d{2}/\d{4}'), '%m/%d/%Y'),
+]
+
+# Spellings accepted for a boolean column (compared lower-cased)
+_BOOL_VALUES = frozenset({'true', 'false', 'yes', 'no', 'y', 'n', '1', '0', 't', 'f'})
+
+# Column-type groups used by the analyzers; 'unknown' columns belong to none
+_TYPE_GROUPS = {"integer": 0, "float": 0, "categorical": 1, "boolean": 1, "text": 1, "datetime": 2}
+
+def classify_columns(column_types):
+    """(numeric, categorical, datetime) column lists from one pass over column_types"""
+    groups = ([], [], [])
+    for col, dtype in column_types.items():
+        group = _TYPE_GROUPS.get(dtype)
+        if group is not None:
+            groups[group].append(col)
+    return groups
+
+def top_k(series, k=5):
+    """value_counts().head(k) without sorting every distinct value
+
+    Ties keep value_counts()' order (first appearance).
+    """
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    if len(counts) > k:
+        # Rank by count, then by first appearance, with one unique key per value
+        key = np.arange(len(counts)) - counts * len(counts)
+        idx = np.argpartition(key, k)[:k]
+        idx = idx[np.argsort(key[idx])]
+    else:
+        idx = np.argsort(-counts, kind='stable')
+    return pd.Series(counts[idx], index=uniques[idx], name='count')
+
+def numeric_corr(df, columns):
+    """df[columns].corr(), from one float64 array when no values are missing"""
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if len(values) < 2 or np.isnan(values).any():
+        # Missing cells need pandas' pairwise-complete handling
+        return df[columns].corr()
+    # Without gaps every pair uses every row, so one product of the
+    # centered columns gives the same matrix (NaN for constant columns)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        matrix = np.corrcoef(values, rowvar=False)
+    return pd.DataFrame(np.atleast_2d(matrix), index=columns, columns=columns)
+
+def _first_mode(series):
+    """Smallest of the most frequent values, or None for an all-null series"""
+    modes = series.mode()
+    if modes.empty:
+        return None
+    # mode() sorts plain values but keeps category order for categoricals
+    if isinstance(modes.dtype, pd.CategoricalDtype):
+        modes = modes.astype(modes.cat.categories.dtype).sort_values(ignore_index=True)
+    return modes[0]
+
+def _as_category(series):
+    """series as a categorical whose categories follow first appearance
+
+    value_counts() then breaks ties the same way it does on the plain values.
+    """
+    values = series.dropna().unique()
+    if isinstance(values, pd.Categorical):
+        values = np.asarray(values)
+    return series.astype(pd.CategoricalDtype(values))
+
 class DataProcessor:
     """Handles CSV loading, validation, and preprocessing with data cleaning"""
     
@@ -12,30 +160,91 @@ class DataProcessor:
         self.column_datatypes = {}
         self.data_profile = {}
         self.cleaning_steps = []
+        # Rows per column used to infer text column types on large uploads
+        self.inference_sample = 100_000
+        # Per-column null/distinct counts shared by type detection and profiling
+        self._counts_frame = None
+        self._counts = None
+        # Row hashing for the profile's duplicate count is opt-in; the app
+        # counts duplicates on the frame it keeps
+        self.profile_duplicates = False
+        # Parsed datetime columns from type detection, reused by profile_data()
+        self._datetime_cache = {}
+        # Frames with more rows than this use the compiled outlier scan when
+        # numba is installed
+        self.numba_min_rows = 100_000
+        
+    def _read_csv(self, uploaded_file, **kwargs):
+        """Read a CSV into Arrow-backed columns when pyarrow is available"""
+        if pa is None:
+            return pd.read_csv(uploaded_file, **kwargs)
         
+        df = pd.read_csv(uploaded_file, engine='pyarrow', dtype_backend='pyarrow', **kwargs)
+        for col, dtype in df.dtypes.items():
+            if not isinstance(dtype, pd.ArrowDtype):
+                continue
+            # The Arrow reader returns undecodable text as binary instead of raising
+            if pa.types.is_binary(dtype.pyarrow_dtype):
+                raise UnicodeDecodeError(kwargs.get('encoding', 'utf-8'), b'', 0, 1, "invalid text in CSV")
+            # Text stays Arrow-backed (compact, bitmap nulls); numbers, booleans and
+            # dates go back to NumPy so missing values remain NaN for the analysis
+            if not pa.types.is_string(dtype.pyarrow_dtype):
+                df[col] = pa.array(df[col].array).to_pandas(date_as_object=False)
+        return df
+    
+    def _sniff_csv(self, uploaded_file):
+        """Guess the encoding and delimiter from the first 64 KB of a CSV"""
+        sample = uploaded_file.read(65536)
+        uploaded_file.seek(0)
+        
+        try:
+            # Incremental decoding tolerates a character cut off by the sample end
+            encoding = 'utf-8'
+            text = codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            guess = from_bytes(sample).best() if from_bytes is not None else None
+            encoding = guess.encoding if guess is not None else 'latin1'
+            text = sample.decode(encoding, errors='replace')
+        
+        try:
+            sep = csv.Sniffer().sniff(text, delimiters=',;\t|').delimiter
+        except csv.Error:
+            sep = ','
+        return encoding, sep
+    
+    def _read_csv_fallback(self, uploaded_file):
+        """Try the usual encodings and delimiters in turn"""
+        try:
+            return self._read_csv(uploaded_file, encoding='utf-8')
+        except UnicodeDecodeError:
+            uploaded_file.seek(0)
+            try:
+                return self._read_csv(uploaded_file, encoding='latin1')
+            except:
+                uploaded_file.seek(0)
+                return self._read_csv(uploaded_file, encoding='ISO-8859-1')
+        except pd.errors.ParserError:
+            uploaded_file.seek(0)
+            try:
+                return self._read_csv(uploaded_file, sep=';', encoding='utf-8')
+            except:
+                uploaded_file.seek(0)
+                return self._read_csv(uploaded_file, sep='\t', encoding='utf-8')
+    
     def load_data(self, uploaded_file):
         """Load and validate CSV file with robust error handling"""
         if uploaded_file is None:
             return None
             
         try:
-            # Try different encodings for CSV
+            # Read once with the sniffed dialect; only a failed read goes
+            # through the encoding/delimiter cascade
+            encoding, sep = self._sniff_csv(uploaded_file)
             try:
-                df = pd.read_csv(uploaded_file, encoding='utf-8')
-            except UnicodeDecodeError:
-                uploaded_file.seek(0)
-                try:
-                    df = pd.read_csv(uploaded_file, encoding='latin1')
-                except:
-                    uploaded_file.seek(0)
-                    df = pd.read_csv(uploaded_file, encoding='ISO-8859-1')
-            except pd.errors.ParserError:
+                df = self._read_csv(uploaded_file, sep=sep, encoding=encoding)
+            except (UnicodeDecodeError, ValueError):
                 uploaded_file.seek(0)
-                try:
-                    df = pd.read_csv(uploaded_file, sep=';', encoding='utf-8')
-                except:
-                    uploaded_file.seek(0)
-                    df = pd.read_csv(uploaded_file, sep='\t', encoding='utf-8')
+                df = self._read_csv_fallback(uploaded_file)
             
             # Validate data
             if df.empty:
@@ -46,12 +255,13 @@ class DataProcessor:
             # Clean column names
             df.columns = df.columns.str.strip().str.replace(' ', '_').str.lower()
             
-            # Store data
-            self.original_df = df.copy()
-            self.processed_df = df.copy()
+            # Store data (shared, not copied: clean_data works on its own copy)
+            self.original_df = df
+            self.processed_df = df
             
             # Analyze data
             self.detect_column_types()
+            df = self.optimize_dtypes()
             self.profile_data()
             
             self.cleaning_steps.append({
@@ -66,6 +276,30 @@ class DataProcessor:
             st.error(f"Error loading CSV: {str(e)}")
             return None
     
+    def _column_counts(self, df):
+        """Null and distinct counts per column, computed once per frame"""
+        if self._counts_frame is not df:
+            self._counts = (pd.Series(null_counts(df), index=df.columns), df.nunique())
+            self._counts_frame = df
+        return self._counts
+    
+    def _parse_datetime(self, values):
+        """values parsed as datetimes, or None if any of them is not a date"""
+        probe = values.dropna().head(50).astype(str)
+        # Text without any digits is not worth handing to the date parser
+        if not probe.str.contains(r'\d').all():
+            return None
+        for regex, fmt in _DATE_FORMATS:
+            if probe.str.fullmatch(regex).all():
+                try:
+                    return pd.to_datetime(values, format=fmt, errors='raise')
+                except Exception:
+                    break
+        try:
+            return pd.to_datetime(values, errors='raise')
+        except:
+            return None
+    
     def detect_column_types(self):
         """Automatically detect column data types"""
         if self.processed_df is None:
@@ -73,19 +307,22 @@ class DataProcessor:
             
         df = self.processed_df
         self.column_datatypes = {}
+        self._datetime_cache = {}
+        na_counts, nunique_all = self._column_counts(df)
         
-        for col in df.columns:
+        # items() and the count arrays line up positionally, so each column is
+        # looked up once
+        for (col, series), na_count, unique_count in zip(df.items(), na_counts.to_numpy(), nunique_all.to_numpy()):
             # Skip columns with all NaN
-            if df[col].isna().all():
+            if na_count == len(df):
                 self.column_datatypes[col] = "unknown"
                 continue
             
             # Check if numeric
-            if pd.api.types.is_numeric_dtype(df[col]):
+            if pd.api.types.is_numeric_dtype(series):
                 # Check if integer
-                non_null = df[col].dropna()
-                if len(non_null) > 0 and non_null.apply(lambda x: x == int(x) if not pd.isna(x) else True).all():
-                    unique_count = df[col].nunique()
+                values = series.dropna().to_numpy(dtype=np.float64)
+                if len(values) > 0 and np.isfinite(values).all() and (values % 1 == 0).all():
                     # If few unique values, might be categorical
                     if unique_count <= 20 and unique_count / len(df) < 0.05:
                         self.column_datatypes[col] = "categorical"
@@ -94,74 +331,110 @@ class DataProcessor:
                 else:
                     self.column_datatypes[col] = "float"
             else:
+                # Large columns are typed from their first non-null values
+                sample = series
+                if len(df) > self.inference_sample:
+                    sample = sample.dropna().head(self.inference_sample)
+                
                 # Try datetime conversion
-                try:
-                    pd.to_datetime(df[col], errors='raise')
+                parsed = self._parse_datetime(sample)
+                if parsed is not None:
                     self.column_datatypes[col] = "datetime"
-                except:
+                    # A sampled parse does not cover the whole column
+                    if len(parsed) == len(df):
+                        self._datetime_cache[col] = parsed
+                else:
                     # Check if boolean
-                    unique_count = df[col].nunique()
-                    lower_values = df[col].dropna().astype(str).str.lower()
-                    bool_values = {'true', 'false', 'yes', 'no', 'y', 'n', '1', '0', 't', 'f'}
+                    # Lower-case only the distinct values, not every row
+                    lower_values = pd.Series(sample.dropna().unique()).astype(str).str.lower()
                     
-                    if set(lower_values.unique()).issubset(bool_values):
+                    if lower_values.isin(_BOOL_VALUES).all():
                         self.column_datatypes[col] = "boolean"
                     elif unique_count <= 20 or unique_count / len(df) < 0.05:
                         self.column_datatypes[col] = "categorical"
                     else:
                         self.column_datatypes[col] = "text"
     
+    def optimize_dtypes(self):
+        """Dictionary-encode repetitive text columns as pandas categoricals"""
+        df = self.processed_df
+        _, nunique_all = self._column_counts(df)
+        text_cols = [col for (col, series), unique_count in zip(df.items(), nunique_all.to_numpy())
+                     if self.column_datatypes.get(col) in ["categorical", "text", "boolean"]
+                     and not pd.api.types.is_numeric_dtype(series)
+                     and unique_count / len(df) < 0.5]
+        if text_cols:
+            df = df.copy(deep=False)
+            for col in text_cols:
+                df[col] = _as_category(df[col])
+            self.original_df = df
+            self.processed_df = df
+            # Recoding leaves the null and distinct counts unchanged
+            self._counts_frame = df
+        return df
+    
     def profile_data(self):
         """Create comprehensive data profile"""
         if self.processed_df is None:
             return
             
         df = self.processed_df
+        n = len(df)
+        na_counts, nunique_all = self._column_counts(df)
         
         self.data_profile = {
-            "row_count": len(df),
+            "row_count": n,
             "column_count": len(df.columns),
-            "missing_values": df.isna().sum().to_dict(),
-            "missing_percentage": (df.isna().sum() / len(df) * 100).to_dict(),
-            "duplicate_rows": df.duplicated().sum(),
+            "missing_values": na_counts.to_dict(),
+            "missing_percentage": (na_counts / n * 100).to_dict(),
+            "duplicate_rows": df.duplicated().sum() if self.profile_duplicates else None,
             "memory_usage": df.memory_usage(deep=True).sum() / (1024 * 1024),  # MB
             "column_types": self.column_datatypes,
             "columns": {}
         }
         
+        # Summary stats for all numeric columns in one describe() call
+        numeric_cols = [col for col in df.columns
+                        if self.column_datatypes.get(col) in ["integer", "float"]]
+        if numeric_cols:
+            desc, has_outliers = self._describe_numeric(df, numeric_cols)
+        
         # Profile each column
-        for col in df.columns:
+        for (col, series), na_count, unique_count in zip(df.items(), na_counts.to_numpy(), nunique_all.to_numpy()):
             col_type = self.column_datatypes.get(col, "unknown")
             col_profile = {
                 "type": col_type,
-                "missing_count": int(df[col].isna().sum()),
-                "missing_percentage": float(df[col].isna().sum() / len(df) * 100),
-                "unique_values": int(df[col].nunique()),
+                "missing_count": int(na_count),
+                "missing_percentage": float(na_count / n * 100),
+                "unique_values": int(unique_count),
             }
             
             # Numeric columns
             if col_type in ["integer", "float"]:
-                if not df[col].dropna().empty:
+                stats = desc[col]
+                if stats['count'] > 0:
                     col_profile.update({
-                        "min": float(df[col].min()),
-                        "max": float(df[col].max()),
-                        "mean": float(df[col].mean()),
-                        "median": float(df[col].median()),
-                        "std": float(df[col].std()) if df[col].std() == df[col].std() else 0.0,  # Check for NaN
-                        "has_outliers": self._has_outliers(df[col]),
+                        "min": float(stats['min']),
+                        "max": float(stats['max']),
+                        "mean": float(stats['mean']),
+                        "median": float(stats['50%']),
+                        "std": float(stats['std']) if pd.notna(stats['std']) else 0.0,  # NaN for a single value
+                        "has_outliers": bool(has_outliers[col]),
                     })
             
             # Categorical columns
             elif col_type in ["categorical", "text", "boolean"]:
-                value_counts = df[col].value_counts().head(5).to_dict()
-                col_profile["top_values"] = value_counts
-                if not df[col].mode().empty:
-                    col_profile["most_common"] = str(df[col].mode()[0])
+                col_profile["top_values"] = top_k(series, 5).to_dict()
+                most_common = _first_mode(series)
+                if most_common is not None:
+                    col_profile["most_common"] = str(most_common)
             
             # Datetime columns
             elif col_type == "datetime":
                 try:
-                    date_series = pd.to_datetime(df[col])
+                    date_series = self._datetime_cache.get(col)
+                    if date_series is None:
+                        date_series = pd.to_datetime(series)
                     col_profile.update({
                         "min_date": str(date_series.min()),
                         "max_date": str(date_series.max()),
@@ -172,20 +445,41 @@ class DataProcessor:
             
             self.data_profile["columns"][col] = col_profile
     
-    def _has_outliers(self, series):
-        """Detect outliers using IQR method"""
-        series = series.dropna()
-        if len(series) < 4:
-            return False
-            
-        Q1 = series.quantile(0.25)
-        Q3 = series.quantile(0.75)
-        IQR = Q3 - Q1
+    def _describe_numeric(self, df, numeric_cols):
+        """describe()-style stats and an IQR outlier flag, computed on one float64 array"""
+        arr = np.ascontiguousarray(df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan))
+        if not len(arr):
+            # nanquantile collapses an empty axis; one all-NaN row gives the same stats
+            arr = np.full((1, len(numeric_cols)), np.nan)
+        count = (~np.isnan(arr)).sum(axis=0)
+        with warnings.catch_warnings():
+            # All-NaN columns and single-value std warn; the NaNs are handled in profile_data
+            warnings.simplefilter('ignore', RuntimeWarning)
+            q1, q3 = np.nanquantile(arr, [0.25, 0.75], axis=0)
+            desc = pd.DataFrame({
+                'count': count,
+                'mean': np.nanmean(arr, axis=0),
+                'std': np.nanstd(arr, axis=0, ddof=1),
+                'min': np.nanmin(arr, axis=0),
+                '25%': q1,
+                '50%': np.nanmedian(arr, axis=0),
+                '75%': q3,
+                'max': np.nanmax(arr, axis=0),
+            }, index=numeric_cols).T
         
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        return ((series < lower_bound) | (series > upper_bound)).any()
+        iqr = q3 - q1
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
+        # NaN compares False on both sides, so missing cells never count
+        if _outlier_any_scan is not None and arr.shape[0] > self.numba_min_rows:
+            # Column-major so each column's scan walks contiguous memory
+            has_outliers = np.empty(arr.shape[1], dtype=np.bool_)
+            _outlier_any_scan(np.asfortranarray(arr), lower_bound, upper_bound, has_outliers)
+        else:
+            has_outliers = ((arr < lower_bound) | (arr > upper_bound)).any(axis=0)
+        # Too few values to call anything an outlier
+        has_outliers[count < 4] = False
+        return desc, pd.Series(has_outliers, index=numeric_cols)
     
     def clean_data(self, remove_duplicates=True, handle_missing='drop_cols', 
                    missing_threshold=0.5, remove_outliers=False):
@@ -193,7 +487,9 @@ class DataProcessor:
         if self.processed_df is None:
             return None
         
-        df = self.processed_df.copy()
+        # A shallow copy is enough: with Copy-on-Write (enabled above) column
+        # data is only duplicated when a step below modifies it
+        df = self.processed_df.copy(deep=False)
         original_shape = df.shape
         
         cleaning_report = {
@@ -204,9 +500,11 @@ class DataProcessor:
         
         # 1. Remove duplicates
         if remove_duplicates:
-            dup_count = df.duplicated().sum()
+            # One row-hash pass serves both the count and the drop
+            dup_mask = df.duplicated()
+            dup_count = int(dup_mask.sum())
             if dup_count > 0:
-                df = df.drop_duplicates()
+                df = df[~dup_mask]
                 cleaning_report['steps_taken'].append(
                     f"Removed {dup_count} duplicate rows"
                 )
@@ -214,8 +512,7 @@ class DataProcessor:
         # 2. Handle missing values
         if handle_missing == 'drop_cols':
             # Drop columns with too much missing data
-            cols_to_drop = [col for col in df.columns 
-                          if df[col].isnull().sum() / len(df) > missing_threshold]
+            cols_to_drop = df.columns[null_counts(df) / len(df) > missing_threshold].tolist()
             if cols_to_drop:
                 df = df.drop(columns=cols_to_drop)
                 cleaning_report['steps_taken'].append(
@@ -234,19 +531,17 @@ class DataProcessor:
         
         elif handle_missing == 'fill_mean':
             # Fill numeric columns with mean
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            for col in numeric_cols:
-                if df[col].isnull().any():
-                    df[col].fillna(df[col].mean(), inplace=True)
+            numeric = df.select_dtypes(include=[np.number])
+            df[numeric.columns] = numeric.fillna(numeric.mean())
             cleaning_report['steps_taken'].append(
                 f"Filled missing numeric values with column means"
             )
         
         elif handle_missing == 'fill_mode':
-            # Fill all columns with mode
-            for col in df.columns:
-                if df[col].isnull().any() and not df[col].mode().empty:
-                    df[col].fillna(df[col].mode()[0], inplace=True)
+            # Fill all columns with mode, in one fillna over the columns with gaps
+            modes = {col: _first_mode(series)
+                     for (col, series), na_count in zip(df.items(), null_counts(df)) if na_count > 0}
+            df = df.fillna({col: mode for col, mode in modes.items() if mode is not None})
             cleaning_report['steps_taken'].append(
                 f"Filled missing values with most common values"
             )
@@ -257,30 +552,36 @@ class DataProcessor:
                           if dtype in ["integer", "float"] and col in df.columns]
             
             outliers_removed = 0
-            for col in numeric_cols:
-                data = df[col].dropna()
-                if len(data) < 4:
-                    continue
-                
-                Q1 = data.quantile(0.25)
-                Q3 = data.quantile(0.75)
+            # Bool columns (0/1) cannot hold IQR outliers
+            sub = df[numeric_cols].select_dtypes(exclude='bool')
+            if len(sub.columns):
+                # Quartiles and bounds for every numeric column at once
+                Q1 = sub.quantile(0.25)
+                Q3 = sub.quantile(0.75)
                 IQR = Q3 - Q1
                 
                 lower_bound = Q1 - 1.5 * IQR
                 upper_bound = Q3 + 1.5 * IQR
                 
-                outlier_mask = (df[col] < lower_bound) | (df[col] > upper_bound)
-                outliers_in_col = outlier_mask.sum()
-                outliers_removed += outliers_in_col
+                outlier_mask = sub.lt(lower_bound, axis=1) | sub.gt(upper_bound, axis=1)
+                # Columns with fewer than 4 values are left alone
+                outlier_mask.loc[:, sub.count() < 4] = False
+                outliers_removed = int(outlier_mask.to_numpy().sum())
                 
                 # Replace outliers with median
-                df.loc[outlier_mask, col] = df[col].median()
+                cols = outlier_mask.columns[outlier_mask.any()]
+                if len(cols):
+                    df[cols] = sub[cols].mask(outlier_mask[cols], sub[cols].median(), axis=1)
             
             if outliers_removed > 0:
                 cleaning_report['steps_taken'].append(
                     f"Replaced {outliers_removed} outlier values with median"
                 )
         
+        # Rows dropped above can leave unused or out-of-order categories
+        for col in df.select_dtypes(include='category').columns:
+            df[col] = _as_category(df[col])
+        
         # Update processed dataframe
         self.processed_df = df
         
@@ -306,18 +607,15 @@ class DataProcessor:
     
     def get_numeric_columns(self):
         """Get list of numeric columns"""
-        return [col for col, dtype in self.column_datatypes.items() 
-                if dtype in ["integer", "float"]]
+        return classify_columns(self.column_datatypes)[0]
     
     def get_categorical_columns(self):
         """Get list of categorical columns"""
-        return [col for col, dtype in self.column_datatypes.items() 
-                if dtype in ["categorical", "boolean", "text"]]
+        return classify_columns(self.column_datatypes)[1]
     
     def get_datetime_columns(self):
         """Get list of datetime columns"""
-        return [col for col, dtype in self.column_datatypes.items() 
-                if dtype == "datetime"]
+        return classify_columns(self.column_datatypes)[2]
     
     def get_cleaning_summary(self):
         """Get summary of all cleaning steps performed"""
@@ -2,30 +2,95 @@
 Interactive Data Explorer - Let users ask questions about their data
 """
 
+import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from data_processor import classify_columns, top_k
 
 class InteractiveExplorer:
     """Allow users to explore data through natural queries"""
     
-    def __init__(self, df, column_types):
+    def __init__(self, df, column_types, datetime_cache=None):
         self.df = df
         self.column_types = column_types
-        self.numeric_cols = [col for col, dtype in column_types.items() 
-                            if dtype in ["integer", "float"]]
-        self.categorical_cols = [col for col, dtype in column_types.items() 
-                                if dtype in ["categorical", "boolean", "text"]]
+        # Already-parsed datetime columns (e.g. DataProcessor._datetime_cache)
+        self.datetime_cache = datetime_cache if datetime_cache is not None else {}
+        self.numeric_cols, self.categorical_cols, _ = classify_columns(column_types)
+        # value_counts() per column, kept across repeated quick-insight requests
+        self._value_counts = {}
+        # Frame sorted by each date column, and mean/sum/count per
+        # (category, metric), reused when the same chart is requested again
+        self._sorted_by_date = {}
+        self._breakdowns = {}
+    
+    def _column_value_counts(self, column):
+        """value_counts() of a column, computed once per explorer"""
+        if column not in self._value_counts:
+            self._value_counts[column] = self.df[column].value_counts()
+        return self._value_counts[column]
+    
+    def _sorted_dt(self, date_col):
+        """The frame with date_col parsed to datetimes and sorted on it, computed once per column"""
+        if date_col not in self._sorted_by_date:
+            dates = self.datetime_cache.get(date_col)
+            if dates is None:
+                dates = pd.to_datetime(self.df[date_col])
+            self._sorted_by_date[date_col] = self.df.assign(**{date_col: dates}).sort_values(date_col)
+        return self._sorted_by_date[date_col]
+    
+    def _category_stats(self, category_col, metric_col):
+        """Mean, sum and count of a metric per category, computed once per pair"""
+        key = (category_col, metric_col)
+        if key not in self._breakdowns:
+            self._breakdowns[key] = self.df.groupby(category_col)[metric_col].agg(['mean', 'sum', 'count'])
+        return self._breakdowns[key]
+    
+    def batch_breakdown(self, pairs):
+        """Mean, sum and count for several (category, metric) pairs, one groupby per category"""
+        metrics_by_category = {}
+        for category_col, metric_col in pairs:
+            if (category_col, metric_col) not in self._breakdowns:
+                metrics = metrics_by_category.setdefault(category_col, [])
+                if metric_col not in metrics:
+                    metrics.append(metric_col)
+        
+        for category_col, metrics in metrics_by_category.items():
+            grouped = self.df.groupby(category_col)[metrics].agg(['mean', 'sum', 'count'])
+            for metric_col in metrics:
+                self._breakdowns[(category_col, metric_col)] = grouped[metric_col]
+        
+        return {(category_col, metric_col): self._breakdowns[(category_col, metric_col)]
+                for category_col, metric_col in pairs}
     
     def create_custom_comparison(self, metric1, metric2, chart_type="scatter"):
         """Create custom comparison charts"""
         
         if chart_type == "scatter":
-            fig = px.scatter(
-                self.df,
-                x=metric1,
-                y=metric2,
+            x = self.df[metric1].to_numpy(dtype=np.float64, na_value=np.nan)
+            y = self.df[metric2].to_numpy(dtype=np.float64, na_value=np.nan)
+            
+            # WebGL markers, so large frames stay cheap to draw
+            fig = go.Figure(go.Scattergl(x=x, y=y, mode='markers', name='Data'))
+            
+            # Least-squares trendline from a closed-form fit (px's trendline="ols"
+            # needs statsmodels and fits a full regression model per chart)
+            valid = ~(np.isnan(x) | np.isnan(y))
+            if valid.sum() >= 2 and np.ptp(x[valid]) > 0:
+                slope, intercept = np.polyfit(x[valid], y[valid], 1)
+                x_line = np.array([x[valid].min(), x[valid].max()])
+                fig.add_trace(go.Scatter(
+                    x=x_line,
+                    y=slope * x_line + intercept,
+                    mode='lines',
+                    name='Trend'
+                ))
+            
+            fig.update_layout(
                 title=f"{metric1.replace('_', ' ').title()} vs {metric2.replace('_', ' ').title()}",
-                trendline="ols"
+                xaxis_title=metric1,
+                yaxis_title=metric2,
+                showlegend=False
             )
             
             insight = f"""
@@ -63,7 +128,7 @@ This shows how values spread out for both metrics.
     def create_category_breakdown(self, category_col, metric_col):
         """Break down a metric by category"""
         
-        grouped = self.df.groupby(category_col)[metric_col].agg(['mean', 'sum', 'count'])
+        grouped = self._category_stats(category_col, metric_col)
         
         fig = go.Figure()
         
@@ -101,9 +166,7 @@ This shows how values spread out for both metrics.
         """Create time series chart if date column exists"""
         
         try:
-            df_temp = self.df.copy()
-            df_temp[date_col] = pd.to_datetime(df_temp[date_col])
-            df_temp = df_temp.sort_values(date_col)
+            df_temp = self._sorted_dt(date_col)
             
             fig = px.line(
                 df_temp,
@@ -175,9 +238,10 @@ This shows how values spread out for both metrics.
                 insights.append("✅ **Data Quality:** Complete")
         
         elif col_type in ["categorical", "text", "boolean"]:
-            value_counts = self.df[column].value_counts()
+            value_counts = self._column_value_counts(column)
             
-            insights.append(f"**Total Categories:** {self.df[column].nunique()}")
+            # value_counts() skips nulls, so its length is nunique()
+            insights.append(f"**Total Categories:** {len(value_counts)}")
             insights.append(f"**Most Common:** {value_counts.index[0]} ({value_counts.iloc[0]} times)")
             
             concentration = (value_counts.iloc[0] / len(self.df)) * 100
@@ -191,7 +255,7 @@ This shows how values spread out for both metrics.
     def create_top_n_chart(self, column, n=10):
         """Create top N chart for any column"""
         
-        value_counts = self.df[column].value_counts().head(n)
+        value_counts = top_k(self.df[column], n)
         
         fig = go.Figure(data=[
             go.Bar(
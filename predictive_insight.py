@@ -2,10 +2,11 @@
 Predictive Insights - Simple forecasting and "what-if" scenarios
 """
 
+import functools
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
+from data_processor import classify_columns, numeric_corr
 
 class PredictiveInsights:
     """Generate simple predictions and forecasts"""
@@ -13,8 +14,12 @@ class PredictiveInsights:
     def __init__(self, df, column_types):
         self.df = df
         self.column_types = column_types
-        self.numeric_cols = [col for col, dtype in column_types.items() 
-                            if dtype in ["integer", "float"]]
+        self.numeric_cols = classify_columns(column_types)[0]
+    
+    @functools.cached_property
+    def corr_matrix(self):
+        """Correlation matrix of the numeric columns, shared by the analyses"""
+        return numeric_corr(self.df, self.numeric_cols)
     
     def simple_forecast(self, column, periods=5):
         """Create simple linear forecast"""
@@ -25,16 +30,16 @@ class PredictiveInsights:
             return None, "Need at least 10 data points for forecasting"
         
         # Prepare data
-        X = np.arange(len(data)).reshape(-1, 1)
-        y = data.values
+        x = np.arange(len(data), dtype=np.float64)
+        y = data.to_numpy(dtype=np.float64)
         
-        # Fit model
-        model = LinearRegression()
-        model.fit(X, y)
+        # Fit a least-squares line in closed form
+        x_centered = x - x.mean()
+        slope = (x_centered @ (y - y.mean())) / (x_centered @ x_centered)
+        intercept = y.mean() - slope * x.mean()
         
         # Make predictions
-        future_X = np.arange(len(data), len(data) + periods).reshape(-1, 1)
-        predictions = model.predict(future_X)
+        predictions = intercept + slope * np.arange(len(data), len(data) + periods)
         
         # Create chart
         fig = go.Figure()
@@ -65,8 +70,8 @@ class PredictiveInsights:
         )
         
         # Calculate trend
-        trend = "increasing" if model.coef_[0] > 0 else "decreasing"
-        avg_change = model.coef_[0]
+        trend = "increasing" if slope > 0 else "decreasing"
+        avg_change = slope
         
         current_avg = data.mean()
         forecast_avg = predictions.mean()
@@ -96,11 +101,40 @@ class PredictiveInsights:
         
         return fig, insight
     
+    def forecast_all(self, columns, periods=5):
+        """Linear forecasts for several columns from one batched least-squares fit"""
+        
+        values = self.df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=0)
+        
+        # Like simple_forecast, each column is indexed by its non-missing
+        # values only, so x is the running count of valid cells
+        x = np.cumsum(valid, axis=0) - 1.0
+        y = np.where(valid, values, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x_mean = np.where(valid, x, 0.0).sum(axis=0) / counts
+            y_mean = y.sum(axis=0) / counts
+            x_centered = np.where(valid, x - x_mean, 0.0)
+            slopes = (x_centered * (y - y_mean)).sum(axis=0) / (x_centered * x_centered).sum(axis=0)
+        intercepts = y_mean - slopes * x_mean
+        
+        # Next `periods` positions after each column's last value
+        future_x = counts + np.arange(periods)[:, None]
+        predictions = pd.DataFrame(intercepts + slopes * future_x, columns=columns,
+                                   index=pd.RangeIndex(1, periods + 1, name='period'))
+        
+        # Same minimum as simple_forecast
+        return predictions.loc[:, counts >= 10]
+    
     def what_if_analysis(self, metric_col, impact_col, scenario_change_pct):
         """Simple what-if scenario analysis"""
         
         # Calculate correlation
-        corr = self.df[[metric_col, impact_col]].corr().iloc[0, 1]
+        if metric_col in self.numeric_cols and impact_col in self.numeric_cols:
+            corr = self.corr_matrix.at[metric_col, impact_col]
+        else:
+            corr = self.df[[metric_col, impact_col]].corr().iloc[0, 1]
         
         if abs(corr) < 0.3:
             return None, f"Weak relationship between {metric_col} and {impact_col} - scenario analysis not meaningful"
@@ -172,16 +206,11 @@ class PredictiveInsights:
         if target_metric not in self.numeric_cols:
             return None, "Target must be a numeric column"
         
-        # Calculate correlations with target
-        correlations = {}
-        for col in self.numeric_cols:
-            if col != target_metric:
-                corr = self.df[[target_metric, col]].corr().iloc[0, 1]
-                if not np.isnan(corr):
-                    correlations[col] = abs(corr)
+        # Correlations with target, from the shared matrix
+        correlations = self.corr_matrix[target_metric].drop(target_metric).abs().dropna()
         
         # Sort by importance
-        sorted_drivers = sorted(correlations.items(), key=lambda x: x[1], reverse=True)[:5]
+        sorted_drivers = list(correlations.nlargest(5).items())
         
         if not sorted_drivers:
             return None, "No significant drivers found"
@@ -215,9 +244,11 @@ class PredictiveInsights:
 **Top 5 Drivers:**
 """
         
+        driver_lines = []
         for i, (driver, strength) in enumerate(sorted_drivers, 1):
             impact = "🔴 Critical" if strength > 0.7 else "🟡 Important" if strength > 0.4 else "🔵 Moderate"
-            insight += f"{i}. {driver.replace('_', ' ').title()} - {impact} ({strength:.0%})\n"
+            driver_lines.append(f"{i}. {driver.replace('_', ' ').title()} - {impact} ({strength:.0%})\n")
+        insight += "".join(driver_lines)
         
         insight += f"""
 
@@ -232,16 +263,17 @@ class PredictiveInsights:
     def calculate_roi_projection(self, investment_col, return_col, investment_amount):
         """Calculate ROI projection based on historical data"""
         
-        # Filter out zero investments
-        mask = (self.df[investment_col] > 0) & (self.df[return_col] > 0)
-        filtered_df = self.df[mask]
+        # Filter out zero investments (NaN fails both comparisons)
+        invested = self.df[investment_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        returned = self.df[return_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        mask = (invested > 0) & (returned > 0)
         
-        if len(filtered_df) < 5:
+        if mask.sum() < 5:
             return None, "Not enough data for ROI calculation"
         
         # Calculate historical ROI
-        filtered_df['roi'] = (filtered_df[return_col] / filtered_df[investment_col]) * 100
-        avg_roi = filtered_df['roi'].mean()
+        roi = returned[mask] / invested[mask] * 100
+        avg_roi = roi.mean()
         
         # Project returns
         projected_return = investment_amount * (avg_roi / 100)
@@ -257,7 +289,7 @@ class PredictiveInsights:
 **Confidence Level:**
 """
         
-        roi_std = filtered_df['roi'].std()
+        roi_std = roi.std(ddof=1)
         if roi_std < 10:
             insight += "🟢 High (Consistent historical returns)\n"
         elif roi_std < 30:
@@ -1,8 +1,10 @@
+import functools
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from data_processor import classify_columns, null_counts, numeric_corr
 
 class TrendAnalyzer:
     """Analyzes trends and creates business-friendly visualizations"""
@@ -11,20 +13,25 @@ class TrendAnalyzer:
         self.df = df
         self.column_types = column_types
 
-        self.numeric_cols = [
-            col for col, dtype in column_types.items()
-            if dtype in ["integer", "float"]
-        ]
+        self.numeric_cols, self.categorical_cols, self.datetime_cols = (
+            classify_columns(column_types)
+        )
+
+        # NaN-free float64 values per numeric column, shared by the analysis
+        # and the charts
+        self._clean_cache = {}
 
-        self.categorical_cols = [
-            col for col, dtype in column_types.items()
-            if dtype in ["categorical", "boolean", "text"]
-        ]
+    def _clean_values(self, col):
+        """Non-missing values of a numeric column as float64, computed once per column"""
+        if col not in self._clean_cache:
+            values = self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            self._clean_cache[col] = values[~np.isnan(values)]
+        return self._clean_cache[col]
 
-        self.datetime_cols = [
-            col for col, dtype in column_types.items()
-            if dtype == "datetime"
-        ]
+    @functools.cached_property
+    def corr_matrix(self):
+        """Correlation matrix of the numeric columns, shared by the correlation views"""
+        return numeric_corr(self.df, self.numeric_cols)
 
     def analyze_trends(self):
         """Perform comprehensive trend analysis"""
@@ -40,36 +47,57 @@ class TrendAnalyzer:
         """Analyze numeric column trends"""
         trends = {}
 
-        for col in self.numeric_cols[:5]:
-            data = self.df[col].dropna()
-            if len(data) == 0:
+        cols = self.numeric_cols[:5]
+        if not cols:
+            return trends
+
+        # One frame-wide reduction per statistic instead of one per column
+        num = self.df[cols].astype(np.float64)
+        counts = num.count()
+        means = num.mean()
+        medians = num.median()
+        stds = num.std()
+        mins = num.min()
+        maxs = num.max()
+
+        for col in cols:
+            if counts[col] == 0:
                 continue
 
-            mean_val = data.mean()
+            mean_val = means[col]
 
             trends[col] = {
                 "mean": float(mean_val),
-                "median": float(data.median()),
-                "std": float(data.std()),
-                "min": float(data.min()),
-                "max": float(data.max()),
-                "range": float(data.max() - data.min()),
-                "trend_direction": self._detect_trend_direction(data),
+                "median": float(medians[col]),
+                "std": float(stds[col]),
+                "min": float(mins[col]),
+                "max": float(maxs[col]),
+                "range": float(maxs[col] - mins[col]),
+                "trend_direction": self._detect_trend_direction(
+                    self._clean_values(col), mean=mean_val
+                ),
                 "coefficient_of_variation": float(
-                    (data.std() / mean_val) * 100
+                    (stds[col] / mean_val) * 100
                 ) if mean_val != 0 else 0.0,
             }
 
         return trends
 
-    def _detect_trend_direction(self, series):
+    def _detect_trend_direction(self, series, mean=None):
         """Detect if series is increasing, decreasing, or stable"""
         if len(series) < 2:
             return "insufficient_data"
 
-        mid = len(series) // 2
-        first_half_mean = series.iloc[:mid].mean()
-        second_half_mean = series.iloc[mid:].mean()
+        # Half means straight from the values (callers pass NaN-free data)
+        values = np.asarray(series, dtype=np.float64)
+        n = values.size
+        mid = n // 2
+        first_half_mean = values[:mid].mean()
+        if mean is None:
+            second_half_mean = values[mid:].mean()
+        else:
+            # A known overall mean leaves only the first half to be read
+            second_half_mean = (mean * n - first_half_mean * mid) / (n - mid)
 
         if second_half_mean > first_half_mean * 1.1:
             return "increasing"
@@ -78,15 +106,19 @@ class TrendAnalyzer:
         else:
             return "stable"
 
+    @functools.cached_property
+    def value_counts(self):
+        """value_counts() of the first 3 categorical columns, shared by the distribution views"""
+        return {col: self.df[col].value_counts() for col in self.categorical_cols[:3]}
+
     def _analyze_categorical_distributions(self):
         """Analyze categorical column distributions"""
         distributions = {}
 
-        for col in self.categorical_cols[:3]:
-            value_counts = self.df[col].value_counts()
-
+        for col, value_counts in self.value_counts.items():
             distributions[col] = {
-                "unique_count": int(self.df[col].nunique()),
+                # Categoricals list unused categories with a count of 0
+                "unique_count": int(np.count_nonzero(value_counts.to_numpy())),
                 "top_values": value_counts.head(5).to_dict(),
                 "most_common": str(value_counts.index[0]),
                 "most_common_count": int(value_counts.iloc[0]),
@@ -102,23 +134,25 @@ class TrendAnalyzer:
         if len(self.numeric_cols) < 2:
             return {}
 
-        corr_matrix = self.df[self.numeric_cols].corr()
+        corr_matrix = self.corr_matrix
         correlations = {}
 
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i + 1, len(corr_matrix.columns)):
-                corr_value = corr_matrix.iloc[i, j]
-
-                if abs(corr_value) > 0.7:
-                    pair = f"{corr_matrix.columns[i]} & {corr_matrix.columns[j]}"
-                    correlations[pair] = {
-                        "coefficient": float(corr_value),
-                        "strength": (
-                            "strong positive"
-                            if corr_value > 0
-                            else "strong negative"
-                        ),
-                    }
+        # Upper-triangle pairs in row order; NaN fails the threshold
+        rows, cols = np.triu_indices(len(corr_matrix.columns), k=1)
+        values = corr_matrix.to_numpy()[rows, cols]
+        strong = np.abs(values) > 0.7
+        names = corr_matrix.columns
+
+        for i, j, corr_value in zip(rows[strong], cols[strong], values[strong]):
+            pair = f"{names[i]} & {names[j]}"
+            correlations[pair] = {
+                "coefficient": float(corr_value),
+                "strength": (
+                    "strong positive"
+                    if corr_value > 0
+                    else "strong negative"
+                ),
+            }
 
         return correlations
 
@@ -131,12 +165,16 @@ class TrendAnalyzer:
 
         for col in self.datetime_cols[:1]:
             try:
-                date_series = pd.to_datetime(self.df[col])
+                date_series = self.df[col]
+                # Only text columns need parsing
+                if not pd.api.types.is_datetime64_any_dtype(date_series):
+                    date_series = pd.to_datetime(date_series)
+                start, end = date_series.min(), date_series.max()
                 time_analysis[col] = {
-                    "start_date": str(date_series.min()),
-                    "end_date": str(date_series.max()),
+                    "start_date": str(start),
+                    "end_date": str(end),
                     "span_days": int(
-                        (date_series.max() - date_series.min()).days
+                        (end - start).days
                     ),
                     "has_trend": True,
                 }
@@ -156,7 +194,7 @@ class TrendAnalyzer:
             "categorical_columns": len(self.categorical_cols),
             "datetime_columns": len(self.datetime_cols),
             "missing_data_pct": float(
-                (self.df.isnull().sum().sum() / total_cells) * 100
+                (null_counts(self.df).sum() / total_cells) * 100
             ),
         }
 
@@ -176,10 +214,15 @@ class TrendAnalyzer:
         )
 
         for idx, col in enumerate(cols_to_plot, start=1):
-            data = self.df[col].dropna()
+            data = self._clean_values(col)
+            data = data[np.isfinite(data)]
+            # Bin here and send 30 bars, not every value for the browser to bin
+            counts, edges = np.histogram(data, bins=30)
             fig.add_trace(
-                go.Histogram(
-                    x=data,
+                go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=counts,
+                    width=np.diff(edges),
                     name=col,
                     marker_color='skyblue',
                     opacity=0.7,
@@ -228,7 +271,7 @@ This histogram shows how your numeric values are spread out.\n
             return None, "No categorical columns found."
 
         col = self.categorical_cols[0]
-        value_counts = self.df[col].value_counts().head(10)
+        value_counts = self.value_counts[col].head(10)
 
         fig = go.Figure(
             data=[
@@ -346,18 +389,14 @@ A quick summary of your key metrics with their performance trends.\n
         if len(self.numeric_cols) < 2:
             return None, "Need at least 2 numeric columns for correlation analysis."
 
-        corr_matrix = self.df[self.numeric_cols[:8]].corr()
-        strong_pos, strong_neg, weak = 0, 0, 0
-
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i + 1, len(corr_matrix.columns)):
-                corr_value = corr_matrix.iloc[i, j]
-                if corr_value > 0.7:
-                    strong_pos += 1
-                elif corr_value < -0.7:
-                    strong_neg += 1
-                else:
-                    weak += 1
+        # Pairwise correlations do not depend on the other columns, so the
+        # first 8 metrics are a corner of the full matrix
+        corr_matrix = self.corr_matrix.iloc[:8, :8]
+        pairs = corr_matrix.to_numpy()[np.triu_indices(len(corr_matrix.columns), k=1)]
+        strong_pos = int((pairs > 0.7).sum())
+        strong_neg = int((pairs < -0.7).sum())
+        # Everything else, NaN included, counts as weak
+        weak = pairs.size - strong_pos - strong_neg
 
         labels = ["Strong Positive", "Strong Negative", "Weak/No Correlation"]
         values = [strong_pos, strong_neg, weak]
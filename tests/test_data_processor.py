@@ -0,0 +1,69 @@
+"""Shared data_processor helpers checked against the pandas calls they replace"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_processor
+from data_processor import null_counts, numeric_corr, top_k
+
+
+def assert_same_counts(result, expected):
+    """Same values in the same order with the same counts"""
+    assert list(result.index) == list(expected.index)
+    assert list(result.to_numpy()) == list(expected.to_numpy())
+
+
+@pytest.mark.parametrize("values", [
+    ["b", "a", "c", "a", "b", "d", "e", "f", "f"],  # ties at the top and the cut
+    ["x", None, "y", "x", np.nan, "z", "y", "w", "v", "u"],  # missing values
+    [3, 1, 2, 1, 3, 2, 4, 5, 6, 7, 7],  # numeric ties
+    ["only", "only", "only"],  # constant
+    ["a", "b"],  # fewer values than k
+])
+def test_top_k_matches_value_counts(values):
+    series = pd.Series(values)
+    assert_same_counts(top_k(series, 5), series.value_counts().head(5))
+
+
+def test_top_k_categorical_matches_value_counts():
+    series = data_processor._as_category(pd.Series(["q", "p", "q", "r", "p", "s", "t", "u", None]))
+    assert_same_counts(top_k(series, 3), series.value_counts().head(3))
+
+
+@pytest.mark.parametrize("rows", [12, data_processor._NULL_SCAN_MIN_ROWS + 1])
+def test_null_counts_matches_isna_sum(rows):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "num": np.where(rng.random(rows) < 0.3, np.nan, rng.normal(size=rows)),
+        "text": np.where(rng.random(rows) < 0.1, None, "v"),
+        "full": np.arange(rows),
+        "empty": np.full(rows, np.nan),
+    })
+    np.testing.assert_array_equal(null_counts(df), df.isna().sum().to_numpy())
+
+
+def _numeric_frame(with_gaps):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "a": rng.normal(size=50),
+        "b": rng.normal(size=50),
+        "const": np.full(50, 4.0),
+    })
+    df["c"] = df["a"] * 2 + rng.normal(scale=0.1, size=50)
+    if with_gaps:
+        df.loc[[3, 17, 30], "a"] = np.nan
+        df.loc[[5, 17], "c"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("with_gaps", [False, True])
+def test_numeric_corr_matches_pandas(with_gaps):
+    df = _numeric_frame(with_gaps)
+    columns = ["a", "b", "const", "c"]
+    pd.testing.assert_frame_equal(numeric_corr(df, columns), df[columns].corr(), rtol=0, atol=1e-12)
+
+
+def test_numeric_corr_single_row_matches_pandas():
+    df = _numeric_frame(False).head(1)
+    pd.testing.assert_frame_equal(numeric_corr(df, ["a", "b"]), df[["a", "b"]].corr())
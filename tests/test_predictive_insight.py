@@ -0,0 +1,27 @@
+"""forecast_all checked against simple_forecast, the per-column fit it batches"""
+
+import numpy as np
+import pandas as pd
+
+from predictive_insight import PredictiveInsights
+
+
+def test_forecast_all_matches_simple_forecast():
+    rng = np.random.default_rng(2)
+    n = 40
+    df = pd.DataFrame({
+        "trend": np.arange(n) * 1.5 + rng.normal(size=n),
+        "gaps": np.where(rng.random(n) < 0.25, np.nan, rng.normal(10, 2, size=n)),
+        "const": np.full(n, 7.0),
+        "short": np.where(np.arange(n) < 9, 1.0, np.nan),
+    })
+    insights = PredictiveInsights(df, {col: "float" for col in df.columns})
+
+    predictions = insights.forecast_all(list(df.columns), periods=5)
+
+    # Columns with fewer than 10 values are left out, as simple_forecast refuses them
+    assert list(predictions.columns) == ["trend", "gaps", "const"]
+    assert insights.simple_forecast("short")[0] is None
+    for col in predictions.columns:
+        fig, _ = insights.simple_forecast(col, periods=5)
+        np.testing.assert_allclose(predictions[col].to_numpy(), fig.data[1].y, rtol=1e-12, atol=1e-12)